@@ -9,29 +9,395 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-import pandas as pd
 import json
 import os
+import csv
 from datetime import datetime
 import threading
 from tkinter import font
 import sys
 import re
-from collections import defaultdict, OrderedDict
+from collections import defaultdict, OrderedDict, namedtuple
 import queue
 import time
-from concurrent.futures import ThreadPoolExecutor
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
+from multiprocessing import shared_memory
+import subprocess
+import hashlib
+import pickle
+import marshal
+import importlib.util
+import unicodedata
+import copy
+import tempfile
+
+# 설치되어 있으면 더 빠른 JSON 직렬화 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pandas/numpy는 창이 뜬 뒤 백그라운드에서 로드 (콜드 스타트 단축)
+pd = None
+np = None
+
+def load_data_libs():
+    """pandas/numpy 지연 로드 (다른 스레드가 로드 중이면 import 잠금에서 대기)"""
+    global pd, np
+    if pd is None:
+        import pandas
+        import numpy
+        np = numpy
+        pd = pandas
+    return pd
+
+# 설정 프로필 (기본 프로필은 기존 파일 그대로, 나머지는 profiles/<이름>/ 아래에 설정 + 규칙 캐시)
+DEFAULT_PROFILE = '기본'
+PROFILES_DIR = 'profiles'
+ACTIVE_PROFILE_FILE = 'active_profile_v4.json'
+
+def profile_paths(name):
+    """프로필의 (설정 파일, 컴파일된 규칙 캐시 파일) 경로"""
+    if not name or name == DEFAULT_PROFILE:
+        return 'playauto_settings_v4.json', 'rule_cache_v4.pkl'
+    directory = os.path.join(PROFILES_DIR, name)
+    return os.path.join(directory, 'playauto_settings_v4.json'), os.path.join(directory, 'rule_cache_v4.pkl')
+
+def list_profiles():
+    """저장된 프로필 이름 (기본 프로필이 항상 처음)"""
+    names = [DEFAULT_PROFILE]
+    if os.path.isdir(PROFILES_DIR):
+        names += sorted(name for name in os.listdir(PROFILES_DIR) if os.path.isfile(profile_paths(name)[0]))
+    return names
+
+def valid_profile_name(name):
+    """프로필 폴더 이름으로 쓸 수 있는지 (경로 구분자/예약 문자 없음, 점으로 시작 안 함)"""
+    return bool(name) and re.fullmatch(r'[^\\/:*?"<>|.][^\\/:*?"<>|]*', name) is not None
+
+def read_active_profile():
+    """마지막으로 선택한 프로필 (없거나 사라졌으면 기본)"""
+    try:
+        with open(ACTIVE_PROFILE_FILE, 'r', encoding='utf-8') as f:
+            name = json.load(f).get('profile', DEFAULT_PROFILE)
+        return name if name in list_profiles() else DEFAULT_PROFILE
+    except (OSError, ValueError, AttributeError):
+        return DEFAULT_PROFILE
+
+# 내보내기에서 뺄 내부 컬럼 (옵션 해석 컬럼 포함 - 실수량만 multiple_by_units일 때 내보냄)
+EXPORT_EXCLUDED_COLUMNS = ['담당자', '분류근거', '신뢰도', 'brand', 'full_product_name', 'priority',
+                           '상품명_정규화', '옵션_정규화', '옵션용량', '옵션단위', '옵션개수', '세트배수', '실수량']
+
+# CSV/TSV 주문 파일 (xlsx보다 훨씬 빨리 읽힘)
+CSV_EXTENSIONS = ('.csv', '.tsv', '.txt')
+
+# 한국 쇼핑몰 CSV 인코딩 후보 (cp949는 euc-kr 상위 호환)
+CSV_ENCODINGS = ('utf-8-sig', 'utf-8', 'cp949')
+
+# 내보내기 담당자별 색 띠 (work_config의 'color'가 없으면 work_order 순서대로)
+EXPORT_BAND_COLORS = ['DDEBF7', 'E2EFDA', 'FFF2CC', 'FCE4D6', 'EDE2F6', 'DEEAF1', 'F8E0EC', 'E7E6E6']
+
+# 주문 파일 필수 컬럼
+REQUIRED_COLUMNS = ['상품명', '주문수량']
+
+# 주문 파일의 텍스트 컬럼 (Arrow 문자열 모드에서 읽을 때부터 Arrow로 변환)
+TEXT_COLUMNS = ['상품명', '주문선택사항', '주문고유번호']
+
+def has_pyarrow():
+    """pyarrow 설치 여부 (가져오지는 않음)"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+def text_dtype(use_arrow):
+    """텍스트 컬럼 dtype - Arrow 모드이고 pyarrow가 설치되어 있으면 'string[pyarrow]', 아니면 기존 str"""
+    return 'string[pyarrow]' if use_arrow and has_pyarrow() else str
+
+# 텍스트 정규화 (NFKC + 공백 정리 + 홍보 문구 괄호 제거) - 규칙과 주문 데이터 모두 같은 형태로 매칭
+# 괄호 안 전체가 홍보 문구일 때만 제거 ("[무료배송]", "(특가/증정)") - "(증정용 세트)", "(New York 스타일)"은 유지
+NOISE_TAGS = ['무료배송', '당일발송', '당일출고', '오늘출발', '빠른배송', '특가', '사은품', '증정',
+              '이벤트', '행사', '신상품', '최저가', '리뉴얼', 'NEW', 'BEST', 'HOT', 'SALE']
+_NOISE_TAG = '(?:' + '|'.join(NOISE_TAGS) + ')'
+NOISE_TAG_PATTERN = re.compile(r'[\[【(]\s*' + _NOISE_TAG + r'(?:\s*[/,·+]?\s*' + _NOISE_TAG + r')*\s*[\]】)]')
+NORMALIZE_CACHE_LIMIT = 500000
+_normalize_cache = {}  # 원본 문자열 -> 정규화 문자열
+
+def normalize_text(text):
+    """매칭용 정규화: 전각/호환 문자와 NFD 한글은 NFKC로, "[무료배송]" 같은 괄호 문구 제거, 공백 하나로"""
+    text = NOISE_TAG_PATTERN.sub(' ', unicodedata.normalize('NFKC', text))
+    return ' '.join(text.split())
+
+def normalize_column(values):
+    """텍스트 Series → 정규화된 배열 (고유 문자열만 정규화, 결과는 문자열별 캐시)"""
+    codes, uniques = pd.factorize(values)
+    cache = _normalize_cache
+    if len(cache) > NORMALIZE_CACHE_LIMIT:
+        cache.clear()
+    
+    normalized = []
+    for text in uniques:
+        text = str(text)
+        result = cache.get(text)
+        if result is None:
+            result = cache[text] = normalize_text(text)
+        normalized.append(result)
+    return np.array(normalized, dtype=object)[codes]
+
+# 옵션 해석 (중량/용량, 낱개 수, 세트 배수) - 예: "92g 10개", "1.5L x2세트", "500ml 3병"
+# 단위 바로 뒤에 배수 기호가 붙은 압축 표기("500gx2", "1.5Lx12병")도 허용
+OPTION_MEASURE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(kg|g|ml|l)(?![a-wyz])', re.IGNORECASE)
+OPTION_PACK_PATTERN = re.compile(r'(\d+)\s*(?:개입|개|입|팩|봉|병|캔)')
+# 배수 기호 x는 단어 안("mix", "MAX")이 아닐 때만 (용량 단위 바로 뒤는 허용),
+# 뒤 숫자에 치수/용량 단위("6x8cm")나 낱개 단위("x24개" - 낱개 수로 셈)가 붙으면 배수 아님
+OPTION_SET_PATTERN = re.compile(r'(?:(?:(?<![a-z])|(?<=\dg)|(?<=\dkg)|(?<=\dml)|(?<=\dl))x|[×*])\s*(\d+)(?![\d.])'
+                                r'(?!\s*(?:mm|cm|m|kg|g|ml|l)(?![a-z]))(?!\s*(?:개입|개|입|팩|봉|병|캔))'
+                                r'|(\d+)\s*(?:세트|set|박스|box)', re.IGNORECASE)
+OPTION_UNITS = {'kg': ('g', 1000), 'g': ('g', 1), 'l': ('ml', 1000), 'ml': ('ml', 1)}
+OPTION_COLUMNS = ['옵션용량', '옵션단위', '옵션개수', '세트배수']
+OPTION_CACHE_LIMIT = 200000
+# 옵션 해석 점검용 예시 - (옵션, 용량(g/ml, 없으면 None), 낱개 수, 세트 배수), --check-options로 실행
+OPTION_PARSE_EXAMPLES = [
+    ('92g 10개', 92, 10, 1),
+    ('1.5L x2세트', 1500, 1, 2),
+    ('500g x 2', 500, 1, 2),
+    ('1kg*3', 1000, 1, 3),
+    ('10개입 2박스', None, 10, 2),
+    ('500gx2', 500, 1, 2),
+    ('1kgx3', 1000, 1, 3),
+    ('1.5Lx2', 1500, 1, 2),
+    ('200mlx24개', 200, 24, 1),
+    ('1.5Lx12병', 1500, 12, 1),
+    ('500g x 10개', 500, 10, 1),
+    ('mix 3종', None, 1, 1),
+    ('MAX 2단계', None, 1, 1),
+    ('6x8cm 1개', None, 1, 1),
+    ('30x40 cm', None, 1, 1),
+    ('박스 x 2.5kg', 2500, 1, 1),
+]
+_option_cache = {}  # 옵션 문자열 -> (용량, 단위, 낱개 수, 세트 배수)
+
+def parse_options(options):
+    """옵션 Series → 해석 결과 DataFrame (같은 인덱스, OPTION_COLUMNS)
+
+    정규식(str.extract)은 처음 보는 고유 옵션에만 실행하고 결과는 옵션 문자열별로 캐시한다.
+    용량은 g/ml 기준, 낱개 수와 세트 배수는 없으면 1.
+    """
+    codes, uniques = pd.factorize(options)
+    uniques = [str(option) for option in uniques]
+    new = pd.Series([option for option in uniques if option not in _option_cache], dtype=object)
+    
+    if len(new):
+        if len(_option_cache) + len(new) > OPTION_CACHE_LIMIT:
+            _option_cache.clear()
+        
+        measure = new.str.extract(OPTION_MEASURE_PATTERN)
+        units = measure[1].str.lower()
+        amounts = pd.to_numeric(measure[0]) * units.map(lambda unit: OPTION_UNITS[unit][1], na_action='ignore')
+        units = units.map(lambda unit: OPTION_UNITS[unit][0], na_action='ignore').fillna('')
+        packs = pd.to_numeric(new.str.extract(OPTION_PACK_PATTERN)[0]).fillna(1).clip(lower=1).astype(int)
+        sets = new.str.extract(OPTION_SET_PATTERN)
+        sets = pd.to_numeric(sets[0].fillna(sets[1])).fillna(1).clip(lower=1).astype(int)
+        
+        _option_cache.update(zip(new.tolist(), zip(amounts.tolist(), units.tolist(), packs.tolist(), sets.tolist())))
+    
+    parsed = pd.DataFrame([_option_cache[option] for option in uniques], columns=OPTION_COLUMNS)
+    parsed = parsed.take(codes)
+    parsed.index = options.index
+    return parsed
+
+class BrandTrie:
+    """알려진 브랜드/별칭의 접두사 트리 - 상품명 앞에서 가장 긴 브랜드를 찾는다
+
+    브랜드 뒤는 단어/괄호 경계여야 하며 ("백제원 떡"은 백제가 아님), 예외로
+    BRAND_SUFFIXES가 붙은 형태("꽃샘식품 꿀생강차")와 설정된 별칭은 붙여 써도 인식한다.
+    "[꽃샘] 꿀유자차"처럼 괄호로 감싼 브랜드도 인식하고, 알려진 브랜드가 없으면
+    기존처럼 첫 단어를 쓴다. 결과는 상품명별로 캐시한다.
+    """
+    LEADING_NOISE = ' \t[(【〔<'
+    BOUNDARY = ')]】〕>/,·([【〔<'
+    BRAND_SUFFIXES = ('식품', '농산', '농원', '푸드', '제과', '수산', '상회')
+    CACHE_LIMIT = 200000
+    
+    def __init__(self, brands=(), aliases=None, observed=()):
+        self.root = {}
+        self.cache = {}
+        for brand in brands:
+            self.add(brand, brand)
+        for alias, brand in (aliases or {}).items():
+            self.add(alias, brand, attached=True)
+        
+        # 기록에서 본 브랜드는 이미 아는 브랜드로 읽히지 않는 것만 (꽃샘식품 → 꽃샘 유지)
+        for brand in observed:
+            key = brand.strip(self.LEADING_NOISE + ')]】〕>')
+            if key and self._longest(key, 0) is None:
+                self.add(key, key)
+    
+    def add(self, key, brand, attached=False):
+        """key로 시작하는 상품명의 브랜드를 brand로 (둘 다 정규화된 형태로 저장)
+
+        attached면 key 바로 뒤에 다른 글자가 붙어 있어도 인식한다 (별칭용).
+        """
+        key, brand = normalize_text(key), normalize_text(brand)
+        if not key:
+            return
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[None] = (brand, attached)
+    
+    def _at_boundary(self, name, end, suffix=True):
+        """name[end]가 브랜드 끝으로 볼 수 있는 자리인지 (문자열 끝/공백/괄호, 또는 회사 접미사 뒤)"""
+        if end >= len(name) or name[end].isspace() or name[end] in self.BOUNDARY:
+            return True
+        return suffix and any(name.startswith(word, end) and self._at_boundary(name, end + len(word), False)
+                              for word in self.BRAND_SUFFIXES)
+    
+    def _longest(self, name, start):
+        """name[start:]의 가장 긴 브랜드 접두사 (경계 조건을 만족하는 것만, 없으면 None)"""
+        node = self.root
+        found = None
+        for position in range(start, len(name)):
+            node = node.get(name[position])
+            if node is None:
+                break
+            terminal = node.get(None)
+            if terminal is not None and (terminal[1] or self._at_boundary(name, position + 1)):
+                found = terminal[0]
+        return found
+    
+    def brand_of(self, name):
+        """상품명 하나의 브랜드"""
+        start = 0
+        while start < len(name) and name[start] in self.LEADING_NOISE:
+            start += 1
+        
+        brand = self._longest(name, start)
+        if brand is None:
+            parts = name.split(None, 1)
+            brand = parts[0] if parts else ''
+        return brand
+    
+    def detect(self, names):
+        """상품명 Series → 브랜드 배열 (고유 상품명만 검사)"""
+        codes, uniques = pd.factorize(names)
+        cache = self.cache
+        if len(cache) > self.CACHE_LIMIT:
+            cache.clear()
+        
+        brands = []
+        for name in uniques:
+            name = str(name)
+            brand = cache.get(name)
+            if brand is None:
+                brand = cache[name] = self.brand_of(name)
+            brands.append(brand)
+        return np.array(brands, dtype=object)[codes]
+
+def detect_csv_format(file_path, sample_size=1024 * 1024):
+    """CSV 인코딩(UTF-8 BOM/UTF-8/CP949)과 구분자(탭/쉼표 등) 추정 - (encoding, sep)"""
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    
+    # 샘플 끝에서 잘린 멀티바이트 문자 제외
+    if len(sample) == sample_size and b'\n' in sample:
+        sample = sample[:sample.rindex(b'\n')]
+    
+    encoding = CSV_ENCODINGS[-1]
+    for candidate in CSV_ENCODINGS:
+        if candidate == 'utf-8-sig' and not sample.startswith(b'\xef\xbb\xbf'):
+            continue
+        try:
+            text = sample.decode(candidate)
+            encoding = candidate
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = sample.decode(encoding, errors='replace')
+    
+    if file_path.lower().endswith('.tsv'):
+        return encoding, '\t'
+    try:
+        sep = csv.Sniffer().sniff(text[:64 * 1024], delimiters=',\t;|').delimiter
+    except csv.Error:
+        sep = '\t' if text.count('\t') > text.count(',') else ','
+    return encoding, sep
+
+def read_order_file(file_path, header_row, dtypes=None, csv_format=None):
+    """주문 파일 전체 로드 (헤더 행부터, 이름 있는 컬럼만) - csv_format은 미리 추정한 (encoding, sep)"""
+    if file_path.lower().endswith(CSV_EXTENSIONS):
+        encoding, sep = csv_format or (None, None)
+        if encoding is None:
+            encoding, sep = detect_csv_format(file_path)
+        options = dict(sep=sep, encoding=encoding, skiprows=header_row, header=0, dtype=dtypes)
+        
+        # pyarrow가 있으면 멀티스레드 파서, 지원하지 않는 옵션이면 C 파서
+        # (pyarrow 엔진은 skiprows로 제목 행을 건너뛰지 않고 오류도 내지 않으므로 헤더가 첫 행일 때만)
+        df = None
+        if has_pyarrow() and len(sep) == 1 and header_row == 0:
+            try:
+                df = pd.read_csv(file_path, engine='pyarrow', **options)
+            except (ValueError, TypeError):
+                df = None
+        if df is None:
+            df = pd.read_csv(file_path, engine='c', low_memory=False, **options)
+        return df[[col for col in df.columns if not str(col).startswith('Unnamed:')]]
+    
+    engine = 'xlrd' if file_path.lower().endswith('.xls') else 'openpyxl'
+    return pd.read_excel(file_path, engine=engine, dtype=dtypes, header=header_row,
+                         usecols=lambda name: not str(name).startswith('Unnamed:'))
+
+def preprocess_orders(df, dtype=str, brands=None, timings=None):
+    """주문 데이터 전처리 (벡터화) - dtype은 텍스트 컬럼 dtype (text_dtype 참고), brands는 BrandTrie
+
+    timings(dict)를 주면 정규화 소요 시간을 'normalize'에 기록한다.
+    """
+    df['상품명'] = df['상품명'].fillna('').astype(dtype)
+    df['주문수량'] = pd.to_numeric(df['주문수량'], errors='coerce').fillna(0).astype(int)
+    
+    # 주문선택사항 처리
+    if '주문선택사항' in df.columns:
+        df['주문선택사항'] = df['주문선택사항'].fillna('').astype(dtype)
+        df['full_product_name'] = df['상품명'] + ' ' + df['주문선택사항']
+    else:
+        df['주문선택사항'] = pd.Series('', index=df.index, dtype=dtype)
+        df['full_product_name'] = df['상품명']
+    
+    # 매칭용 정규화 컬럼 (원본 상품명/옵션은 표시/내보내기용으로 그대로)
+    started = time.perf_counter()
+    df['상품명_정규화'] = pd.Series(normalize_column(df['상품명']), index=df.index).astype(dtype)
+    df['옵션_정규화'] = pd.Series(normalize_column(df['주문선택사항']), index=df.index).astype(dtype)
+    if timings is not None:
+        timings['normalize'] = time.perf_counter() - started
+    
+    # 옵션 해석 → 실수량 = 주문수량 × 낱개 수 × 세트 배수
+    parsed = parse_options(df['옵션_정규화'])
+    for column in OPTION_COLUMNS:
+        df[column] = parsed[column].to_numpy()
+    df['실수량'] = df['주문수량'] * df['옵션개수'] * df['세트배수']
+    
+    # 브랜드 추출 (고유 상품명 단위, 알려진 브랜드가 없으면 첫 단어)
+    brands = brands or BrandTrie()
+    df['brand'] = pd.Series(brands.detect(df['상품명_정규화']), index=df.index).astype(dtype)
+    
+    # 주문번호 처리
+    if '주문고유번호' in df.columns:
+        df['주문고유번호'] = df['주문고유번호'].fillna('').astype(dtype)
+    else:
+        # 행 위치로 만든 번호 - 파일마다 다른 주문을 가리키므로 증분 모드에서 쓰지 않음
+        df['주문고유번호'] = pd.Series(np.arange(len(df)).astype(str), index=df.index).astype(dtype)
+        df.attrs['synthetic_order_ids'] = True
+    
+    return df
 
 class FastProgressDialog:
     """초고속 진행률 표시 다이얼로그"""
-    def __init__(self, parent, title="처리 중..."):
+    def __init__(self, parent, title="처리 중...", modal=True):
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(title)
         self.dialog.geometry("450x250")
         self.dialog.resizable(False, False)
         self.dialog.transient(parent)
-        self.dialog.grab_set()
+        if modal:
+            self.dialog.grab_set()
         
         # 부모 창 중앙에 위치
         parent.update_idletasks()
@@ -98,13 +464,15 @@ class FastProgressDialog:
         self.cancelled = False
         self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
         
+        self.closed = False
+        
         # 성능 최적화: 업데이트 쓰로틀링
         self.last_update_time = 0
         self.update_interval = 0.05  # 50ms 간격으로만 업데이트
         
     def update(self, percent, status="", sub_percent=0):
         """진행률 업데이트 (성능 최적화)"""
-        if self.cancelled:
+        if self.cancelled or self.closed:
             return
             
         current_time = time.time()
@@ -132,23 +500,489 @@ class FastProgressDialog:
     
     def close(self):
         """다이얼로그 닫기"""
-        if not self.cancelled:
+        if not self.cancelled and not self.closed:
+            self.closed = True
             self.dialog.destroy()
 
+class CompiledRuleSet:
+    """브랜드 인덱스로 컴파일된 매칭 규칙 (설정 해시와 함께 캐시 파일로 저장)
+
+    브랜드가 지정된 규칙은 같은 브랜드 상품에만 매칭되므로, 브랜드별로
+    해당 브랜드 규칙과 브랜드 없는 규칙만 원래 순서대로 모아 둔다.
+    버킷은 규칙 위치와 무관한 항목 튜플로 구성되어, 설정이 바뀌면
+    구성이 달라진 브랜드 버킷만 다시 만들고 나머지는 이전 것을 재사용한다.
+    
+    codegen 엔진은 버킷마다 검사 문자열을 상수로 박아 넣은 함수를 생성해
+    브랜드 dict로 분기한다 (build_codegen, 바이트코드도 캐시 파일에 함께 저장).
+    
+    브랜드와 검사 문자열은 normalize_text로 정규화해 두고, 주문 쪽 정규화 컬럼과 비교한다.
+    """
+    FORMAT = 5
+
+    def __init__(self, rules, settings_hash, previous=None):
+        self.format = self.FORMAT
+        self.rules = rules
+        self.hash = settings_hash
+        self.previous_bodies = previous.bucket_bodies if previous is not None and \
+            getattr(previous, 'format', None) == self.FORMAT else {}
+        self.bucket_bodies = {}
+        self.codegen_code = None
+        self.codegen_tag = None
+        self._generated = None
+
+        wildcard = []
+        signatures = defaultdict(list)
+        for rule in rules:
+            entry = self.make_entry(rule)
+            brand = normalize_text(rule['brand'])
+            if brand:
+                # 버킷 안에서의 위치는 앞선 브랜드 없는 규칙 수로 결정됨
+                signatures[brand].append((len(wildcard), entry))
+            else:
+                wildcard.append(entry)
+
+        self.wildcard = tuple(wildcard)
+        self.signatures = {brand: tuple(signature) for brand, signature in signatures.items()}
+
+        # 브랜드 없는 규칙이 그대로면 구성이 같은 버킷은 재사용
+        reusable = (previous is not None and getattr(previous, 'format', None) == self.FORMAT
+                    and previous.wildcard == self.wildcard)
+        self.by_brand = {}
+        self.rebuilt_brands = 0
+        for brand, signature in self.signatures.items():
+            if reusable and previous.signatures.get(brand) == signature:
+                self.by_brand[brand] = previous.by_brand[brand]
+            else:
+                self.by_brand[brand] = self._merge_bucket(signature)
+                self.rebuilt_brands += 1
+    
+    def __getstate__(self):
+        # 생성된 함수는 피클할 수 없음 - 바이트코드(codegen_code)만 저장하고 로드 후 다시 exec
+        state = self.__dict__.copy()
+        state['_generated'] = None
+        state['previous_bodies'] = {}
+        return state
+
+    @staticmethod
+    def rules_from_settings(settings):
+        """설정의 상품 규칙을 매칭 순서(work_order)대로 펼친 목록"""
+        rules = []
+        for work_name in settings['work_order']:
+            work_config = settings['work_config'][work_name]
+            if work_config.get('type') != 'product_specific':
+                continue
+            
+            for index, product in enumerate(work_config.get('products', [])):
+                rules.append({
+                    'work_name': work_name,
+                    'index': index,
+                    'brand': product.get('brand', ''),
+                    'product_name': product.get('product_name', ''),
+                    'order_option': product.get('order_option', 'All')
+                })
+        return rules
+    
+    @staticmethod
+    def rule_key(rule):
+        """실행 간 규칙 식별 키 (순서 변경에도 유지)"""
+        return f"{rule['work_name']} | {rule['brand']} | {rule['product_name']} | {rule['order_option']}"
+
+    @classmethod
+    def make_entry(cls, rule):
+        """매칭 항목: (규칙 키, 담당자, 상품명 검사, 옵션 검사, 분류근거) - 'All'/빈 문자열은 검사 생략(None)
+
+        검사 문자열은 정규화된 형태, 규칙 키와 분류근거는 원본 그대로.
+        """
+        return (cls.rule_key(rule),
+                rule['work_name'],
+                cls.check_text(rule['product_name']),
+                cls.check_text(rule['order_option']),
+                f"매칭: {rule['brand']} {rule['product_name']}")
+
+    @staticmethod
+    def check_text(value):
+        """규칙 검사 문자열 (정규화) - 'All'/빈 문자열만 None(검사 생략)
+
+        정규화하면 비는 문자열(예: 홍보 문구만 있는 "[무료배송]")은 전체 매칭이 되지 않도록 원본을 그대로 쓴다.
+        """
+        if value in ('All', ''):
+            return None
+        normalized = _normalize_cache.get(value)
+        if normalized is None:
+            normalized = _normalize_cache[value] = normalize_text(value)
+        return normalized or value
+
+    def _merge_bucket(self, signature):
+        """브랜드 규칙을 브랜드 없는 규칙 사이의 원래 자리에 끼워 넣은 버킷"""
+        bucket = []
+        position = 0
+        for rank, entry in signature:
+            bucket.extend(self.wildcard[position:rank])
+            position = rank
+            bucket.append(entry)
+        bucket.extend(self.wildcard[position:])
+        return tuple(bucket)
+
+    @staticmethod
+    def hash_settings(settings):
+        """매칭 결과에 영향을 주는 설정(work_order + work_config)의 내용 해시"""
+        payload = json.dumps({'work_order': settings['work_order'], 'work_config': settings['work_config']},
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def new_stats(self):
+        """규칙 키별 [평가 횟수, 매칭 행수, 소요 시간(초)]"""
+        return {self.rule_key(rule): [0, 0, 0.0] for rule in self.rules}
+
+    def candidates(self, brand):
+        """상품 브랜드에 대해 평가할 항목 (순서 유지)"""
+        return self.by_brand.get(brand, self.wildcard)
+
+    @staticmethod
+    def _first_position(bucket, product_name, order_option):
+        """버킷에서 처음 통과하는 항목의 위치 (없으면 -1)"""
+        for position, (_, _, name_check, option_check, _) in enumerate(bucket):
+            if ((name_check is None or name_check in product_name) and
+                    (option_check is None or option_check in order_option)):
+                return position
+        return -1
+
+    def match(self, brand, product_name, order_option, rule_stats, weight=1):
+        """첫 번째로 매칭되는 항목 (없으면 None), 규칙별 통계 누적
+
+        시간은 키 단위로 한 번만 재서 평가된 규칙에 균등 배분한다 (규칙마다 재면 측정이 검사보다 비쌈).
+        """
+        bucket = self.candidates(brand)
+        started = time.perf_counter()
+        position = self._first_position(bucket, product_name, order_option)
+        self._add_stats(rule_stats, bucket, position, 1, weight, time.perf_counter() - started)
+        return bucket[position] if position >= 0 else None
+
+    @staticmethod
+    def _add_stats(rule_stats, bucket, position, keys, rows, seconds):
+        """버킷의 position까지 평가된 키 수/시간과 통과 규칙의 행 수를 규칙별 통계에 반영"""
+        evaluated = bucket if position < 0 else bucket[:position + 1]
+        share = seconds / len(evaluated) if evaluated else 0.0
+        for entry in evaluated:
+            stats = rule_stats[entry[0]]
+            stats[0] += keys
+            stats[2] += share
+        if position >= 0:
+            rule_stats[bucket[position][0]][1] += rows
+
+    def explain(self, brand, product_name, order_option):
+        """한 상품의 매칭 과정 재현 - [(항목, 통과 여부, 사유)] (첫 매칭에서 멈춤)
+
+        설명 요청 시에만 호출되며 대량 매칭 경로(match/생성 함수)는 건드리지 않는다.
+        """
+        trace = []
+        for entry in self.candidates(brand):
+            _, _, name_check, option_check, _ = entry
+            if name_check is not None and name_check not in product_name:
+                trace.append((entry, False, f"상품명에 '{name_check}' 없음"))
+            elif option_check is not None and option_check not in order_option:
+                trace.append((entry, False, f"옵션에 '{option_check}' 없음"))
+            else:
+                checks = [f"상품명 '{name_check}'" if name_check else "상품명 All",
+                          f"옵션 '{option_check}'" if option_check else "옵션 All"]
+                trace.append((entry, True, " + ".join(checks) + " 통과"))
+                break
+        return trace
+
+    def matcher(self, rule_stats, engine='interpreted'):
+        """엔진별 매칭 함수 - (match(brand, product_name, order_option, weight), finish())
+
+        finish()는 모든 매칭 후 한 번 호출해서 rule_stats를 마무리한다.
+        """
+        if engine == 'codegen':
+            return self._generated_matcher(rule_stats)
+        
+        # 키마다 (브랜드 버킷, 통과 위치)만 집계하고 finish()에서 규칙별로 펼침 (_generated_matcher와 같은 방식)
+        by_brand = self.by_brand
+        buckets = dict(by_brand)
+        buckets[None] = self.wildcard
+        tally = defaultdict(lambda: [0, 0, 0.0])  # (브랜드 또는 None, 위치) -> [키 수, 행 수, 시간]
+        first_position = self._first_position
+        perf_counter = time.perf_counter
+        
+        def match(brand, product_name, order_option, weight=1):
+            if brand not in by_brand:
+                brand = None
+            bucket = buckets[brand]
+            started = perf_counter()
+            position = first_position(bucket, product_name, order_option)
+            counts = tally[brand, position]
+            counts[2] += perf_counter() - started
+            counts[0] += 1
+            counts[1] += weight
+            return bucket[position] if position >= 0 else None
+        
+        def finish():
+            for (brand, position), (keys, rows, seconds) in tally.items():
+                self._add_stats(rule_stats, buckets[brand], position, keys, rows, seconds)
+            tally.clear()
+        
+        return match, finish
+
+    def _bucket_body(self, bucket):
+        """버킷 함수 본문 - 첫 번째로 통과한 항목의 버킷 내 위치 (없으면 -1)"""
+        lines = []
+        for position, (_, _, name_check, option_check, _) in enumerate(bucket):
+            conditions = []
+            if name_check is not None:
+                conditions.append(f"{name_check!r} in p")
+            if option_check is not None:
+                conditions.append(f"{option_check!r} in o")
+            if not conditions:
+                # 검사 없는 규칙은 항상 매칭 - 뒤의 규칙은 도달 불가
+                lines.append(f"    return {position}")
+                return "\n".join(lines)
+            lines.append(f"    if {' and '.join(conditions)}: return {position}")
+        lines.append("    return -1")
+        return "\n".join(lines)
+
+    def build_codegen(self):
+        """버킷별 특화 함수 소스 생성 → compile() (바뀌지 않은 버킷의 본문은 이전 것 재사용)"""
+        previous_bodies = self.previous_bodies
+        buckets = [(None, self.wildcard)] + list(self.by_brand.items())
+        
+        source = []
+        for i, (brand, bucket) in enumerate(buckets):
+            body = previous_bodies.get(brand)
+            if body is None or body[0] != bucket:
+                body = (bucket, self._bucket_body(bucket))
+            self.bucket_bodies[brand] = body
+            source.append(f"def _m{i}(p, o):\n{body[1]}")
+        source.append("DEFAULT = _m0")
+        source.append("DISPATCH = {" + ", ".join(f"{brand!r}: _m{i}"
+                                                 for i, (brand, _) in enumerate(buckets) if i) + "}")
+        
+        code = compile("\n".join(source), f"<rules {self.hash[:12]}>", 'exec')
+        self.codegen_code = marshal.dumps(code)
+        self.codegen_tag = sys.implementation.cache_tag
+        self.previous_bodies = {}
+        self._generated = None
+
+    def _load_generated(self):
+        """생성된 함수 로드 (바이트코드가 다른 파이썬 버전용이면 다시 생성)"""
+        if self.codegen_code is None or self.codegen_tag != sys.implementation.cache_tag:
+            self.build_codegen()
+        namespace = {}
+        exec(marshal.loads(self.codegen_code), namespace)
+        self._generated = (namespace['DISPATCH'], namespace['DEFAULT'])
+        return self._generated
+
+    def _generated_matcher(self, rule_stats):
+        """생성된 함수로 매칭 (match와 결과 동일)
+
+        키마다 (버킷 함수, 통과 위치)만 집계하고, 규칙별 평가 횟수/매칭 행수는 finish()에서
+        위치로부터 역산한다. 소요 시간은 평가된 규칙에 균등 배분한다.
+        """
+        dispatch, default = self._generated or self._load_generated()
+        buckets = {default: self.wildcard}
+        buckets.update((dispatch[brand], bucket) for brand, bucket in self.by_brand.items())
+        tally = defaultdict(lambda: [0, 0, 0.0])  # (버킷 함수, 위치) -> [키 수, 행 수, 시간]
+        perf_counter = time.perf_counter
+        
+        def match(brand, product_name, order_option, weight=1):
+            function = dispatch.get(brand, default)
+            started = perf_counter()
+            position = function(product_name, order_option)
+            counts = tally[function, position]
+            counts[2] += perf_counter() - started
+            counts[0] += 1
+            counts[1] += weight
+            return buckets[function][position] if position >= 0 else None
+        
+        def finish():
+            for (function, position), (keys, rows, seconds) in tally.items():
+                self._add_stats(rule_stats, buckets[function], position, keys, rows, seconds)
+            tally.clear()
+        
+        return match, finish
+
+# 멀티코어 매칭 워커 상태 (워커 프로세스마다 초기화 시 한 번만 받음)
+_worker_compiled = None
+_worker_engine = None
+_worker_entry_ids = None
+
+def _init_match_worker(compiled, engine):
+    """매칭 워커 초기화 - 컴파일된 규칙을 프로세스당 한 번만 역직렬화"""
+    global _worker_compiled, _worker_engine, _worker_entry_ids
+    load_data_libs()
+    _worker_compiled = compiled
+    _worker_engine = engine
+    _worker_entry_ids = {}
+    for i, rule in enumerate(compiled.rules):
+        _worker_entry_ids.setdefault(CompiledRuleSet.rule_key(rule), i)
+
+def _match_shard(names, key_count, start, stop):
+    """공유 메모리의 키 [start, stop) 구간 매칭 - 결과는 공유 결과 배열에 규칙 번호(없으면 -1)로 기록
+
+    names: (키 바이트, 오프셋, 행 수, 결과) 공유 메모리 이름
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        offsets = np.ndarray((key_count * 3 + 1,), dtype=np.int64, buffer=blocks[1].buf)
+        counts = np.ndarray((key_count,), dtype=np.int64, buffer=blocks[2].buf)
+        results = np.ndarray((key_count,), dtype=np.int32, buffer=blocks[3].buf)
+        
+        # 이 구간의 바이트만 복사해서 디코드
+        base = int(offsets[start * 3])
+        text = bytes(blocks[0].buf[base:int(offsets[stop * 3])])
+        bounds = (offsets[start * 3:stop * 3 + 1] - base).tolist()
+        
+        rule_stats = _worker_compiled.new_stats()
+        match, finish = _worker_compiled.matcher(rule_stats, _worker_engine)
+        for k in range(start, stop):
+            i = (k - start) * 3
+            brand, product_name, order_option = (text[bounds[i + j]:bounds[i + j + 1]].decode('utf-8')
+                                                 for j in range(3))
+            entry = match(brand, product_name, order_option, int(counts[k]))
+            results[k] = _worker_entry_ids[entry[0]] if entry else -1
+        finish()
+        
+        del offsets, counts, results
+        return {key: stats for key, stats in rule_stats.items() if stats[0]}
+    finally:
+        for block in blocks:
+            block.close()
+
+class SettingsWriter:
+    """JSON 파일 백그라운드 저장
+
+    짧은 시간 안에 같은 파일 저장이 반복되면 마지막 내용만 한 번 쓰고(디바운스),
+    임시 파일에 쓴 뒤 교체하므로 저장 중 종료되어도 기존 파일이 깨지지 않는다.
+    """
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.pending = {}  # 경로 -> (데이터 사본, indent, 저장 예정 시각)
+        self.writing = 0
+        self.condition = threading.Condition()
+        self.on_written = None  # 저장 완료 콜백 (경로) - 저장 스레드에서 호출됨
+        
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+    
+    def save(self, path, data, indent=None):
+        """저장 예약 (호출 시점의 내용을 사본으로 고정)"""
+        snapshot = pickle.loads(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        with self.condition:
+            self.pending[path] = (snapshot, indent, time.monotonic() + self.delay)
+            self.condition.notify_all()
+    
+    def flush(self, timeout=10):
+        """예약된 저장을 즉시 실행하고 끝날 때까지 대기 (종료 시)"""
+        with self.condition:
+            self.pending = {path: (data, indent, 0) for path, (data, indent, _) in self.pending.items()}
+            self.condition.notify_all()
+            self.condition.wait_for(lambda: not self.pending and not self.writing, timeout)
+    
+    def is_busy(self, path):
+        """저장 예약 또는 쓰기 진행 중 여부 (외부 변경 감지 시 자기 저장과 구분)"""
+        with self.condition:
+            return path in self.pending or self.writing > 0
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while True:
+                    now = time.monotonic()
+                    ready = {path: item for path, item in self.pending.items() if item[2] <= now}
+                    if ready:
+                        break
+                    due = min((item[2] for item in self.pending.values()), default=None)
+                    self.condition.wait(None if due is None else due - now)
+                
+                for path in ready:
+                    del self.pending[path]
+                self.writing += 1
+            
+            try:
+                for path, (data, indent, _) in ready.items():
+                    try:
+                        self._write(path, data, indent)
+                    except Exception as e:
+                        # 한 파일의 오류로 저장 스레드가 멈추면 이후 저장이 모두 사라짐
+                        print(f"파일 저장 오류 ({path}): {e}")
+            finally:
+                with self.condition:
+                    self.writing -= 1
+                    self.condition.notify_all()
+    
+    def _write(self, path, data, indent):
+        """임시 파일에 쓰고 원자적으로 교체"""
+        # 직렬화 실패(문자열이 아닌 키, numpy 값 등)는 이 파일만 건너뛰고 저장 스레드는 유지
+        try:
+            if orjson is not None:
+                content = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+            else:
+                content = json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            print(f"파일 저장 오류 ({path}): {e}")
+            return
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"파일 저장 오류 ({path}): {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        
+        if self.on_written:
+            self.on_written(path)
+
+# 한 번의 분류 실행이 사용하는 고정 스냅샷 (실행 중 UI에서 설정을 편집해도 영향 없음)
+RuleSetSnapshot = namedtuple('RuleSetSnapshot', [
+    'version',             # 규칙 내용 해시 앞 12자리 (통계에 기록)
+    'settings',            # 설정 사본 (수정 금지)
+    'work_order',
+    'quantity_threshold',
+    'failed_work',
+    'combined_work',
+    'multiple_work',
+    'compiled'             # CompiledRuleSet (실행 스레드에서 채움)
+])
+
 class PlayAutoOrderClassifierV41:
-    def __init__(self):
+    NEW_PROFILE_LABEL = "➕ 새 프로필..."
+    STAGE_LABELS = {'normalize': "정규화", 'preprocess': "전처리", 'classify': "분류", 'sort': "정렬"}
+    
+    def __init__(self, profile=None):
+        self.startup_started = time.perf_counter()
+        self.startup_probe = False
+        self.profile = profile or read_active_profile()
+        self.profile_rules = {}  # 프로필 -> 컴파일된 규칙 (전환 시 즉시 재사용)
+        
         self.root = tk.Tk()
+        self.root.withdraw()  # 준비될 때까지 스플래시만 표시
         self.setup_window()
         self.setup_modern_styles()
+        
+        self.splash = self.show_splash_screen()
+        self.set_splash_status("설정 불러오는 중...")
+        self.settings_writer = SettingsWriter()
+        self.settings_writer.on_written = self._on_file_written
+        self.processing = False
         self.load_settings()
+        self.set_splash_status("화면 구성 중...")
         self.create_widgets()
         
         # 성능 최적화를 위한 변수들
         self.excel_data = None
         self.classified_data = None
+        self.delta_data = None
         self.work_ranges = {}
         self.unmatched_products = {}
-        self.product_history = {}
         
         # 스레드 풀 (성능 향상)
         self.executor = ThreadPoolExecutor(max_workers=4)
@@ -254,21 +1088,28 @@ class PlayAutoOrderClassifierV41:
                       foreground=[('selected', self.colors['neon_green'])])
     
     def load_settings(self):
-        """설정 파일 로드 (성능 최적화)"""
-        self.settings_file = 'playauto_settings_v4.json'
+        """현재 프로필의 설정 파일 로드 (성능 최적화)"""
+        self.settings_file, self.rule_cache_file = profile_paths(self.profile)
+        self.settings_mtime = None
         self.product_history_file = 'product_history_v4.json'
+        self.rule_stats_file = 'rule_stats_v4.json'
+        self.order_state_file = 'order_state_v4.json'
         
         try:
             if os.path.exists(self.settings_file):
+                self.settings_mtime = os.stat(self.settings_file).st_mtime_ns
                 with open(self.settings_file, 'r', encoding='utf-8') as f:
                     self.settings = json.load(f)
             else:
                 # 기본 설정은 기존과 동일
                 self.settings = self.get_default_settings()
+                if os.path.dirname(self.settings_file):
+                    os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
                 self.save_settings()
         except Exception as e:
             print(f"설정 로드 오류: {e}")
             self.settings = self.get_default_settings()
+        self._mark_settings_saved()
         
         # 상품 기록 로드
         try:
@@ -280,6 +1121,23 @@ class PlayAutoOrderClassifierV41:
         except Exception as e:
             print(f"상품 기록 로드 오류: {e}")
             self.product_history = {}
+        
+        # 규칙 사용 통계는 통계 탭을 열거나 분류를 실행할 때 로드 (_ensure_rule_stats)
+        self.rule_stats = None
+        
+        # 증분 모드용 처리된 주문 기록 로드
+        try:
+            if os.path.exists(self.order_state_file):
+                with open(self.order_state_file, 'r', encoding='utf-8') as f:
+                    self.order_state = json.load(f)
+            else:
+                self.order_state = {}
+        except Exception as e:
+            print(f"주문 기록 로드 오류: {e}")
+            self.order_state = {}
+        
+        # 컴파일된 매칭 규칙 캐시
+        self._load_rule_cache()
     
     def get_default_settings(self):
         """기본 설정 반환"""
@@ -374,24 +1232,328 @@ class PlayAutoOrderClassifierV41:
             },
             "auto_learn": True,
             "min_confidence": 1.0,
-            "quantity_threshold": 2
+            "quantity_threshold": 2,
+            "rule_stats_runs": 10,
+            "settings_watch_seconds": 2,
+            "arrow_strings": False,
+            "parallel_workers": 0,
+            "parallel_min_keys": 20000,
+            "column_profiles": {},
+            "delta_mode": False,
+            "invoice_order_key": "주문고유번호",
+            "invoice_file_key": "주문고유번호",
+            "matcher_engine": "interpreted",
+            "multiple_by_units": False,
+            "brand_aliases": {}
         }
     
     def save_settings(self):
-        """설정 파일 저장"""
+        """설정 파일 저장 (백그라운드, 사람이 편집하는 파일이라 들여쓰기 유지)"""
+        self.settings_writer.save(self.settings_file, self.settings, indent=2)
+        self._mark_settings_saved()
+        
+        # 규칙이 바뀌었으면 매칭 엔진을 백그라운드에서 미리 다시 컴파일
+        self._schedule_rule_compile()
+    
+    def _mark_settings_saved(self):
+        """현재 설정을 파일과 같은 상태로 기록 (저장하지 않은 편집 감지용)"""
+        self.saved_settings_json = json.dumps(self.settings, ensure_ascii=False, sort_keys=True)
+    
+    def _settings_dirty(self):
+        """마지막 로드/저장 이후 메모리에서만 바뀐 설정이 있는지"""
+        return json.dumps(self.settings, ensure_ascii=False, sort_keys=True) != self.saved_settings_json
+    
+    def _on_file_written(self, path):
+        """백그라운드 저장 완료 (저장 스레드) - 자기 저장은 외부 변경으로 보지 않도록 기록"""
+        if path == self.settings_file:
+            try:
+                self.settings_mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+    
+    def watch_settings_file(self):
+        """설정 파일 외부 변경 감시 (다른 창/편집기에서 수정하면 다시 읽어 반영)"""
+        try:
+            mtime = os.stat(self.settings_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        # 저장 중이거나 처리 중이면 다음 확인 때 반영
+        if (mtime is not None and mtime != self.settings_mtime and not self.processing and
+                not self.settings_writer.is_busy(self.settings_file)):
+            self.reload_settings(mtime)
+        
+        interval = self.settings.get('settings_watch_seconds', 2)
+        self.root.after(int(interval * 1000), self.watch_settings_file)
+    
+    def reload_settings(self, mtime):
+        """변경된 설정 파일 다시 읽기 (매칭 엔진은 바뀐 브랜드만 재컴파일)"""
+        self.settings_mtime = mtime
+        
+        try:
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+            for work_name in settings['work_order']:
+                settings['work_config'][work_name]['products']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 편집기가 저장 중인 불완전한 파일일 수 있음 - 다음 변경 때 다시 시도
+            print(f"설정 다시 읽기 오류: {e}")
+            self.update_status(f"⚠️ 설정 파일 변경을 반영하지 못했습니다: {e}")
+            return
+        
+        # 저장하지 않은 편집이 있으면 덮어쓰기 전에 확인 (아니오면 이번 파일 변경은 건너뜀)
+        if self._settings_dirty() and not messagebox.askyesno(
+                "설정 파일 변경",
+                "다른 곳에서 설정 파일이 바뀌었습니다.\n\n"
+                "파일 내용을 불러오면 저장하지 않은 변경사항이 사라집니다. 불러오시겠습니까?\n"
+                "(아니오: 지금 편집 중인 설정 유지 - 다음 저장 때 파일을 덮어씁니다)"):
+            self.update_status("⚠️ 저장하지 않은 변경이 있어 설정 파일 변경을 반영하지 않았습니다")
+            return
+        
+        self.settings = settings
+        self._mark_settings_saved()
+        self.processing = True
+        threading.Thread(target=self._reload_rules_background, args=(copy.deepcopy(settings),),
+                         daemon=True).start()
+    
+    def _reload_rules_background(self, settings):
+        """다시 읽은 설정으로 매칭 엔진 갱신 (백그라운드)"""
+        previous = self.compiled_rules
+        compiled = self._get_compiled_rules(settings)
+        rebuilt = 0 if compiled is previous else compiled.rebuilt_brands
+        self.root.after(0, lambda: self._on_settings_reloaded(compiled, rebuilt))
+    
+    def _on_settings_reloaded(self, compiled, rebuilt):
+        """설정 다시 읽기 완료 - 화면 갱신 후 불러온 주문이 있으면 재분류"""
+        self.refresh_work_list()
+        self.refresh_rule_tree()
+        
+        message = f"🔄 설정 파일 변경 반영 (브랜드 {rebuilt}/{len(compiled.by_brand)}개 재컴파일)"
+        self.update_status(message)
+        
+        if self.excel_data is None or self.classified_data is None:
+            self.processing = False
+            return
+        
+        # 불러온 주문을 새 규칙으로 다시 분류 (파일은 다시 읽지 않음)
+        self.process_button.config(state='disabled')
+        self.download_button.config(state='disabled')
+        self.invoice_button.config(state='disabled')
+        self.review_button.config(state='disabled')
+        self.update_status(message + " - 재분류 중...")
+        
+        snapshot = self._take_rule_snapshot()
+        thread = threading.Thread(target=self._reclassify_loaded, args=(snapshot,))
+        thread.daemon = True
+        thread.start()
+    
+    def _load_rule_cache(self):
+        """컴파일된 매칭 규칙 캐시 로드 (설정이 바뀌었으면 백그라운드 재컴파일)"""
+        if not hasattr(self, 'rule_compile_lock'):
+            self.rule_compile_lock = threading.Lock()
+        self.compiled_rules = None
+        
+        # 이번 실행에서 이미 쓰던 프로필이면 메모리의 것 그대로
+        settings_hash = CompiledRuleSet.hash_settings(self.settings)
+        cached = self.profile_rules.get(self.profile)
+        if cached is not None and cached.hash == settings_hash:
+            self.compiled_rules = cached
+            return
+        
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, ensure_ascii=False, indent=2)
+            if os.path.exists(self.rule_cache_file):
+                with open(self.rule_cache_file, 'rb') as f:
+                    cached = pickle.load(f)
+                if (isinstance(cached, CompiledRuleSet) and
+                        getattr(cached, 'format', None) == CompiledRuleSet.FORMAT and
+                        cached.hash == settings_hash):
+                    self.compiled_rules = cached
         except Exception as e:
-            print(f"설정 저장 오류: {e}")
+            print(f"규칙 캐시 로드 오류: {e}")
+        
+        if self.compiled_rules is None:
+            self._schedule_rule_compile()
+    
+    def _schedule_rule_compile(self):
+        """매칭 엔진 백그라운드 컴파일 (UI 스레드에서 떠 둔 설정 사본으로)"""
+        if not hasattr(self, 'rule_compile_lock'):
+            return
+        settings = copy.deepcopy(self.settings)
+        threading.Thread(target=self._get_compiled_rules, args=(settings, self.profile), daemon=True).start()
+    
+    def _get_compiled_rules(self, settings, profile=None):
+        """주어진 설정의 컴파일된 매칭 규칙 (해시가 같으면 재사용)
+
+        settings는 다른 스레드가 수정하지 않는 사본이어야 한다.
+        profile을 주면 그 사이 프로필이 바뀌었을 때 현재 프로필 캐시를 덮어쓰지 않는다.
+        """
+        settings_hash = CompiledRuleSet.hash_settings(settings)
+        
+        with self.rule_compile_lock:
+            if profile is not None and profile != self.profile:
+                return CompiledRuleSet(self._compile_matching_rules(settings), settings_hash)
+            
+            compiled = self.compiled_rules
+            changed = compiled is None or compiled.hash != settings_hash
+            if changed:
+                # 이전 컴파일 결과가 있으면 바뀐 브랜드 버킷만 다시 만듦
+                compiled = CompiledRuleSet(self._compile_matching_rules(settings), settings_hash,
+                                           previous=compiled)
+            
+            # codegen 엔진이면 특화 함수 바이트코드도 미리 만들어 캐시에 함께 저장
+            if settings.get('matcher_engine') == 'codegen' and compiled.codegen_code is None:
+                compiled.build_codegen()
+                changed = True
+            
+            if changed:
+                self.compiled_rules = compiled
+                self.profile_rules[self.profile] = compiled
+                
+                try:
+                    with open(self.rule_cache_file, 'wb') as f:
+                        pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    print(f"규칙 캐시 저장 오류: {e}")
+        
+        return compiled
     
     def save_product_history(self):
-        """상품 분류 기록 저장"""
+        """상품 분류 기록 저장 (백그라운드)"""
+        self.settings_writer.save(self.product_history_file, self.product_history)
+    
+    def _ensure_rule_stats(self):
+        """규칙 사용 통계를 처음 필요할 때 로드 (이전 형식은 누적 합계 + 최근 실행으로 변환)"""
+        if self.rule_stats is not None:
+            return self.rule_stats
+        
         try:
-            with open(self.product_history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.product_history, f, ensure_ascii=False, indent=2)
+            if os.path.exists(self.rule_stats_file):
+                with open(self.rule_stats_file, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+            else:
+                stats = {}
         except Exception as e:
-            print(f"상품 기록 저장 오류: {e}")
+            print(f"규칙 통계 로드 오류: {e}")
+            stats = {}
+        
+        if 'run_count' not in stats:
+            # 이전 형식: 실행마다 모든 규칙을 기록 - 다시 누적하면서 매칭된 규칙만 남김
+            old_runs = stats.get('runs', [])
+            stats = {'run_count': 0, 'rules': {}, 'runs': []}
+            for run in old_runs:
+                self._add_rule_run(stats, run, run.get('rules', {}))
+        
+        self.rule_stats = stats
+        return stats
+    
+    def _add_rule_run(self, stats, run, rule_stats):
+        """실행 하나를 누적 합계에 더하고, 최근 실행 목록에는 매칭된 규칙만 기록"""
+        stats['run_count'] += 1
+        run['seq'] = stats['run_count']
+        
+        # 누적 합계는 현재 규칙만 유지 (삭제된 규칙은 정리) - [평가, 매칭, 시간, 처음 실행 번호]
+        totals = {}
+        hit_rules = {}
+        for key, (evaluated, hits, seconds) in rule_stats.items():
+            total = stats['rules'].get(key) or [0, 0, 0.0, run['seq']]
+            total[0] += evaluated
+            total[1] += hits
+            total[2] = round(total[2] + seconds, 6)
+            totals[key] = total
+            if hits:
+                hit_rules[key] = [evaluated, hits, round(seconds, 6)]
+        stats['rules'] = totals
+        
+        run['rules'] = hit_rules
+        runs = stats['runs']
+        runs.append(run)
+        del runs[:-max(self.settings.get('rule_stats_runs', 10), 1)]
+    
+    def save_rule_stats(self):
+        """규칙 사용 통계 저장 (백그라운드)"""
+        self.settings_writer.save(self.rule_stats_file, self.rule_stats)
+    
+    def save_order_state(self):
+        """증분 모드 주문 기록 저장 (백그라운드)"""
+        self.settings_writer.save(self.order_state_file, self.order_state)
+    
+    def on_profile_selected(self, event=None):
+        """프로필 콤보박스 선택"""
+        name = self.profile_var.get()
+        if name == self.NEW_PROFILE_LABEL:
+            self.profile_var.set(self.profile)
+            self.create_profile()
+        else:
+            self.switch_profile(name)
+    
+    def create_profile(self):
+        """현재 설정을 복사해 새 프로필 생성 후 전환 (같은 규칙이라 컴파일 캐시도 복사)"""
+        name = simpledialog.askstring("새 프로필", "프로필 이름 (예: 여름, 2창고):", parent=self.root)
+        if not name:
+            return
+        name = name.strip()
+        if name in list_profiles() or not valid_profile_name(name):
+            messagebox.showerror("Error", f"사용할 수 없는 프로필 이름입니다: {name}")
+            return
+        
+        settings_file, rule_cache_file = profile_paths(name)
+        os.makedirs(os.path.dirname(settings_file), exist_ok=True)
+        self.settings_writer.save(settings_file, self.settings, indent=2)
+        self.settings_writer.flush()
+        
+        compiled = self.compiled_rules
+        if compiled is not None and compiled.hash == CompiledRuleSet.hash_settings(self.settings):
+            self.profile_rules[name] = compiled
+            try:
+                with open(rule_cache_file, 'wb') as f:
+                    pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                print(f"규칙 캐시 저장 오류: {e}")
+        
+        self.switch_profile(name)
+    
+    def switch_profile(self, name):
+        """설정 프로필 전환 (각 프로필의 컴파일된 규칙 캐시를 그대로 사용 - 재컴파일 없음)"""
+        if name == self.profile:
+            return
+        if self.processing:
+            messagebox.showwarning("프로필 전환", "처리 중에는 프로필을 바꿀 수 없습니다.")
+            self.profile_var.set(self.profile)
+            return
+
+        # 저장하지 않은 편집이 있으면 전환 전에 확인 (예: 저장 후 전환, 아니오: 버리고 전환, 취소: 그대로)
+        if self._settings_dirty():
+            answer = messagebox.askyesnocancel(
+                "프로필 전환",
+                f"'{self.profile}' 프로필에 저장하지 않은 변경사항이 있습니다.\n\n"
+                "저장한 뒤 전환하시겠습니까?\n"
+                "(아니오: 변경사항을 버리고 전환)")
+            if answer is None:
+                self.profile_var.set(self.profile)
+                return
+            if answer:
+                self.settings_writer.save(self.settings_file, self.settings, indent=2)
+                self._mark_settings_saved()
+
+        # 현재 프로필의 저장 대기분을 먼저 기록
+        self.settings_writer.flush()
+        with self.rule_compile_lock:
+            if self.compiled_rules is not None:
+                self.profile_rules[self.profile] = self.compiled_rules
+            self.profile = name
+        
+        self.load_settings()
+        self.settings_writer.save(ACTIVE_PROFILE_FILE, {'profile': name})
+        
+        # 화면 갱신
+        self.profile_var.set(name)
+        self.profile_combo.config(values=list_profiles() + [self.NEW_PROFILE_LABEL])
+        self.delta_mode_var.set(self.settings.get('delta_mode', False))
+        self.refresh_work_list()
+        self.refresh_rule_tree()
+        
+        state = "캐시 사용" if self.compiled_rules is not None else "규칙 컴파일 중"
+        self.update_status(f"🗂 프로필 전환: {name} ({state})")
     
     def create_widgets(self):
         """메인 UI 위젯 생성 (모던 디자인)"""
@@ -422,6 +1584,25 @@ class PlayAutoOrderClassifierV41:
                                  fg=self.colors['text_secondary'])
         subtitle_label.pack()
         
+        # 설정 프로필 선택 (계절별 규칙, 창고별 설정 등)
+        profile_frame = tk.Frame(header_frame, bg=self.colors['bg'])
+        profile_frame.place(relx=1.0, rely=0.5, x=-20, anchor='e')
+        
+        tk.Label(profile_frame, text="🗂 프로필",
+                font=self.fonts['small'],
+                bg=self.colors['bg'],
+                fg=self.colors['text_secondary']).pack(side='left', padx=(0, 8))
+        
+        self.profile_var = tk.StringVar(value=self.profile)
+        self.profile_combo = ttk.Combobox(profile_frame,
+                                         textvariable=self.profile_var,
+                                         values=list_profiles() + [self.NEW_PROFILE_LABEL],
+                                         state='readonly',
+                                         font=self.fonts['body'],
+                                         width=14)
+        self.profile_combo.pack(side='left')
+        self.profile_combo.bind('<<ComboboxSelected>>', self.on_profile_selected)
+        
         # 메인 콘텐츠 영역
         content_frame = tk.Frame(main_container, bg=self.colors['bg_secondary'])
         content_frame.pack(fill='both', expand=True, padx=20, pady=(0, 15))
@@ -430,15 +1611,31 @@ class PlayAutoOrderClassifierV41:
         self.notebook = ttk.Notebook(content_frame)
         self.notebook.pack(fill='both', expand=True)
         
-        # 탭 생성
+        # 탭 생성 (홈 탭만 즉시, 나머지는 처음 선택될 때 생성)
         self.create_main_tab()
-        self.create_work_management_tab()
-        self.create_product_settings_tab()
-        self.create_stats_tab()
+        self.lazy_tabs = {}
+        self.add_lazy_tab("📋 분류 결과", self.create_results_tab)
+        self.add_lazy_tab("👥 담당자", self.create_work_management_tab)
+        self.add_lazy_tab("🎯 상품설정", self.create_product_settings_tab)
+        self.add_lazy_tab("📈 통계 분석", self.create_stats_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         # 하단 상태바
         self.create_status_bar()
     
+    def add_lazy_tab(self, text, builder):
+        """빈 탭만 추가하고 내용은 처음 선택될 때 생성"""
+        tab = tk.Frame(self.notebook, bg=self.colors['bg_secondary'])
+        self.notebook.add(tab, text=text)
+        self.lazy_tabs[str(tab)] = (tab, builder)
+    
+    def on_tab_changed(self, event):
+        """탭 선택 시 아직 만들지 않은 탭 생성"""
+        entry = self.lazy_tabs.pop(self.notebook.select(), None)
+        if entry:
+            tab, builder = entry
+            builder(tab)
+    
     def create_status_bar(self):
         """하단 상태바 생성 (모던 디자인)"""
         status_frame = tk.Frame(self.root, bg=self.colors['panel'], height=35)
@@ -672,6 +1869,17 @@ class PlayAutoOrderClassifierV41:
                                         **button_config)
         self.download_button.pack(side='left', padx=10)
         
+        # 송장 매칭 버튼 (택배사 송장 파일을 분류 결과에 병합)
+        self.invoice_button = tk.Button(button_frame,
+                                       text="🚚 송장 매칭",
+                                       bg=self.colors['neon_purple'],
+                                       fg=self.colors['text_primary'],
+                                       activebackground=self.colors['info'],
+                                       state='disabled',
+                                       command=self.join_invoices,
+                                       **button_config)
+        self.invoice_button.pack(side='left', padx=10)
+        
         # 검토 버튼
         self.review_button = tk.Button(button_frame,
                                       text="🔍 미분류 검토",
@@ -682,11 +1890,30 @@ class PlayAutoOrderClassifierV41:
                                       command=self.review_unmatched,
                                       **button_config)
         self.review_button.pack(side='left', padx=10)
+        
+        # 증분 모드 (이전 실행 이후 새로 추가/변경된 주문만 분류)
+        self.delta_mode_var = tk.BooleanVar(value=self.settings.get('delta_mode', False))
+        tk.Checkbutton(button_frame,
+                      text="🔁 증분 모드",
+                      variable=self.delta_mode_var,
+                      command=self.toggle_delta_mode,
+                      font=self.fonts['body'],
+                      bg=self.colors['panel'],
+                      fg=self.colors['text_secondary'],
+                      selectcolor=self.colors['card'],
+                      activebackground=self.colors['panel'],
+                      bd=0,
+                      cursor='hand2').pack(side='left', padx=10)
     
-    def create_work_management_tab(self):
+    def toggle_delta_mode(self):
+        """증분 모드 설정 저장"""
+        self.settings['delta_mode'] = self.delta_mode_var.get()
+        self.save_settings()
+        state = "켜짐 - 새로 추가/변경된 주문만 분류" if self.settings['delta_mode'] else "꺼짐"
+        self.update_status(f"🔁 증분 모드 {state}")
+    
+    def create_work_management_tab(self, work_tab):
         """업무 관리 탭 생성"""
-        work_tab = tk.Frame(self.notebook, bg=self.colors['bg_secondary'])
-        self.notebook.add(work_tab, text="👥 담당자")
         
         # 메인 레이아웃
         main_frame = tk.Frame(work_tab, bg=self.colors['bg_secondary'])
@@ -837,25 +2064,11 @@ class PlayAutoOrderClassifierV41:
             btn.bind('<Enter>', on_enter)
             btn.bind('<Leave>', on_leave)
     
-    def create_product_settings_tab(self):
+    def create_product_settings_tab(self, products_tab):
         """상품 설정 탭 생성 (성능 최적화)"""
-        products_tab = tk.Frame(self.notebook, bg=self.colors['bg_secondary'])
-        self.notebook.add(products_tab, text="🎯 상품설정")
-        
-        # 스크롤 가능한 영역
-        canvas = tk.Canvas(products_tab, bg=self.colors['bg_secondary'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(products_tab, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['bg_secondary'])
-        
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=(0, 2))
-        scrollbar.pack(side="right", fill="y", padx=(0, 3))
         
         # 헤더
-        header_frame = tk.Frame(scrollable_frame, bg=self.colors['bg_secondary'])
+        header_frame = tk.Frame(products_tab, bg=self.colors['bg_secondary'])
         header_frame.pack(fill='x', padx=15, pady=15)
         
         title_label = tk.Label(header_frame,
@@ -873,7 +2086,7 @@ class PlayAutoOrderClassifierV41:
         subtitle_label.pack(pady=(5, 0))
         
         # 도움말 카드
-        help_card = tk.Frame(scrollable_frame, bg=self.colors['card'])
+        help_card = tk.Frame(products_tab, bg=self.colors['card'])
         help_card.pack(fill='x', padx=15, pady=8)
         
         help_text = """🎯 간단 가이드:
@@ -889,211 +2102,529 @@ class PlayAutoOrderClassifierV41:
                              justify='left')
         help_label.pack(padx=15, pady=12)
         
-        # 상품 설정 컨테이너
-        self.products_container = tk.Frame(scrollable_frame, bg=self.colors['bg_secondary'])
-        self.products_container.pack(fill='x', padx=15, pady=8)
-        
+        # 하단 버튼 영역
+        bottom_frame = tk.Frame(products_tab, bg=self.colors['bg_secondary'])
+        bottom_frame.pack(side='bottom', pady=15)
+
+        # 규칙 분석 버튼
+        analyze_btn = tk.Button(bottom_frame,
+                               text="🔍 규칙 분석",
+                               font=self.fonts['body'],
+                               bg=self.colors['neon_yellow'],
+                               fg=self.colors['bg'],
+                               activebackground=self.colors['warning'],
+                               bd=0, padx=25, pady=15,
+                               cursor='hand2',
+                               command=self.analyze_rules)
+        analyze_btn.pack(side='left', padx=10)
+
+        # 규칙 압축 버튼
+        compress_btn = tk.Button(bottom_frame,
+                                text="🧩 규칙 압축",
+                                font=self.fonts['body'],
+                                bg=self.colors['neon_blue'],
+                                fg=self.colors['bg'],
+                                activebackground=self.colors['info'],
+                                bd=0, padx=25, pady=15,
+                                cursor='hand2',
+                                command=self.compress_rules)
+        compress_btn.pack(side='left', padx=10)
+
+        # 규칙 가져오기/내보내기 버튼
+        import_btn = tk.Button(bottom_frame,
+                              text="📥 규칙 가져오기",
+                              font=self.fonts['body'],
+                              bg=self.colors['neon_purple'],
+                              fg=self.colors['text_primary'],
+                              bd=0, padx=25, pady=15,
+                              cursor='hand2',
+                              command=self.import_rules)
+        import_btn.pack(side='left', padx=10)
+
+        export_btn = tk.Button(bottom_frame,
+                              text="📤 규칙 내보내기",
+                              font=self.fonts['body'],
+                              bg=self.colors['neon_purple'],
+                              fg=self.colors['text_primary'],
+                              bd=0, padx=25, pady=15,
+                              cursor='hand2',
+                              command=self.export_rules)
+        export_btn.pack(side='left', padx=10)
+
         # 저장 버튼
-        save_btn = tk.Button(scrollable_frame,
+        save_btn = tk.Button(bottom_frame,
                             text="💾 모든 상품 규칙 저장",
                             font=self.fonts['body'],
                             bg=self.colors['neon_green'],
                             fg=self.colors['bg'],
                             activebackground=self.colors['success'],
-                            bd=0, padx=40, pady=15,
+                            bd=0, padx=25, pady=15,
                             cursor='hand2',
                             command=self.save_product_settings)
-        save_btn.pack(pady=15)
-        
-        # 상품 프레임 초기화
-        self.product_frames = {}
-        self.product_lists = {}
-        self.refresh_product_frames()
-    
-    def refresh_product_frames(self):
-        """상품 설정 프레임 새로고침 (성능 최적화)"""
-        # 기존 프레임 제거
-        for widget in self.products_container.winfo_children():
-            widget.destroy()
-        
-        self.product_frames = {}
-        self.product_lists = {}
-        
-        # 워커별 프레임 생성
-        for work_name in self.settings['work_order']:
-            work_config = self.settings['work_config'][work_name]
-            if work_config.get('type') == 'product_specific':
-                self.create_worker_product_frame(work_name, work_config)
-    
-    def create_worker_product_frame(self, work_name, work_config):
-        """개별 워커의 상품 설정 프레임 (균형잡힌 레이아웃)"""
-        # 워커 컨테이너 (전체 너비 활용)
-        worker_frame = tk.Frame(self.products_container, bg=self.colors['panel'])
-        worker_frame.pack(fill='both', expand=True, pady=8)
-        
-        # 메인 가로 레이아웃 (전체 공간 활용)
-        main_layout = tk.Frame(worker_frame, bg=self.colors['panel'])
-        main_layout.pack(fill='both', expand=True, padx=15, pady=10)
+        save_btn.pack(side='left', padx=10)
         
-        # 좌측: 워커 정보 및 컨트롤 (고정 너비 축소)
-        left_section = tk.Frame(main_layout, bg=self.colors['card'], width=250)
-        left_section.pack(side='left', fill='y', padx=(0, 15))
-        left_section.pack_propagate(False)
+        # 검색 및 규칙 편집 툴바
+        toolbar = tk.Frame(products_tab, bg=self.colors['panel'])
+        toolbar.pack(fill='x', padx=15, pady=(8, 0))
         
-        icon = work_config.get('icon', '📦')
-        desc = work_config.get('description', '')
-        
-        # 워커 정보 헤더
-        info_header = tk.Frame(left_section, bg=self.colors['card'])
-        info_header.pack(fill='x', padx=15, pady=(15, 10))
-        
-        worker_label = tk.Label(info_header,
-                            text=f"{icon} {work_name}",
-                            font=self.fonts['header'],
-                            bg=self.colors['card'],
-                            fg=self.colors['neon_blue'])
-        worker_label.pack(anchor='w')
-        
-        desc_label = tk.Label(info_header,
-                            text=desc,
-                            font=self.fonts['small'],
-                            bg=self.colors['card'],
-                            fg=self.colors['text_secondary'],
-                            wraplength=220)
-        desc_label.pack(anchor='w', pady=(5, 0))
+        tk.Label(toolbar, text="🔎",
+                font=self.fonts['body'],
+                bg=self.colors['panel'],
+                fg=self.colors['text_secondary']).pack(side='left', padx=(15, 5), pady=10)
         
-        # 컨트롤 버튼들 (더 컴팩트하게)
-        control_frame = tk.Frame(left_section, bg=self.colors['card'])
-        control_frame.pack(fill='x', padx=10, pady=(0, 10))
+        self.rule_search_var = tk.StringVar()
+        search_entry = tk.Entry(toolbar,
+                               textvariable=self.rule_search_var,
+                               font=self.fonts['body'],
+                               bg=self.colors['card'],
+                               fg=self.colors['text_primary'],
+                               insertbackground=self.colors['neon_green'],
+                               bd=0, width=40)
+        search_entry.pack(side='left', pady=10, ipady=4)
+        self.rule_search_var.trace_add('write', lambda *args: self._schedule_rule_filter())
+        self._rule_filter_job = None
         
-        # 버튼 스타일 (더 작고 세련되게)
         btn_config = {
             'font': ('SF Pro Display', 11),
             'bd': 0,
             'padx': 15,
-            'pady': 10,
-            'cursor': 'hand2',
-            'width': 18
+            'pady': 6,
+            'cursor': 'hand2'
         }
         
-        add_btn = tk.Button(control_frame,
-                        text="➕ 규칙 추가",
-                        bg=self.colors['neon_green'],
-                        fg=self.colors['bg'],
-                        command=lambda: self.add_product_rule(work_name),
-                        **btn_config)
-        add_btn.pack(fill='x', pady=2)
-        
-        edit_btn = tk.Button(control_frame,
-                            text="✏️ 규칙 수정",
-                            bg=self.colors['neon_blue'],
-                            fg=self.colors['bg'],
-                            command=lambda: self.edit_selected_rule(work_name),
-                            **btn_config)
-        edit_btn.pack(fill='x', pady=2)
-        
-        delete_btn = tk.Button(control_frame,
-                            text="❌ 규칙 삭제",
-                            bg=self.colors['neon_pink'],
-                            fg=self.colors['bg'],
-                            command=lambda: self.delete_selected_rule(work_name),
-                            **btn_config)
-        delete_btn.pack(fill='x', pady=2)
+        for text, color, command in [("❌ 규칙 삭제", 'neon_pink', self.delete_selected_rule),
+                                     ("✏️ 규칙 수정", 'neon_blue', self.edit_selected_rule),
+                                     ("➕ 규칙 추가", 'neon_green', self.add_product_rule)]:
+            tk.Button(toolbar, text=text,
+                     bg=self.colors[color],
+                     fg=self.colors['bg'],
+                     command=command,
+                     **btn_config).pack(side='right', padx=(0, 10), pady=10)
+        
+        # 규칙 트리 (담당자 노드는 펼칠 때 규칙 행을 생성)
+        self.style.configure('Rules.Treeview',
+                           background=self.colors['card'],
+                           fieldbackground=self.colors['card'],
+                           foreground=self.colors['text_primary'],
+                           rowheight=26,
+                           font=('SF Pro Display', 12))
+        self.style.configure('Rules.Treeview.Heading',
+                           background=self.colors['panel'],
+                           foreground=self.colors['text_secondary'],
+                           font=('SF Pro Display', 11, 'bold'))
+        self.style.map('Rules.Treeview',
+                      background=[('selected', self.colors['neon_green'])],
+                      foreground=[('selected', self.colors['bg'])])
+        
+        tree_frame = tk.Frame(products_tab, bg=self.colors['card'])
+        tree_frame.pack(fill='both', expand=True, padx=15, pady=8)
+        
+        self.rule_tree = ttk.Treeview(tree_frame,
+                                     columns=('brand', 'product_name', 'order_option'),
+                                     style='Rules.Treeview',
+                                     selectmode='browse')
+        self.rule_tree.heading('#0', text='담당자 / 번호', anchor='w')
+        self.rule_tree.heading('brand', text='브랜드', anchor='w')
+        self.rule_tree.heading('product_name', text='상품명', anchor='w')
+        self.rule_tree.heading('order_option', text='옵션', anchor='w')
+        self.rule_tree.column('#0', width=220, stretch=False)
+        self.rule_tree.column('brand', width=160, stretch=False)
+        self.rule_tree.column('product_name', width=480)
+        self.rule_tree.column('order_option', width=180, stretch=False)
+        self.rule_tree.tag_configure('worker', foreground=self.colors['neon_blue'],
+                                     font=('SF Pro Display', 13, 'bold'))
+        self.rule_tree.tag_configure('empty', foreground=self.colors['text_muted'])
+        
+        tree_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.rule_tree.yview)
+        self.rule_tree.configure(yscrollcommand=tree_scrollbar.set)
+        self.rule_tree.pack(side='left', fill='both', expand=True)
+        tree_scrollbar.pack(side='right', fill='y')
+        
+        self.rule_tree.bind('<<TreeviewOpen>>', self._on_rule_tree_open)
+        self.rule_tree.bind('<Double-1>', lambda e: self.edit_selected_rule())
+        
+        # 트리 아이템 ↔ 규칙 매핑
+        self.rule_worker_items = {}
+        self.rule_items = {}
+        self.refresh_rule_tree()
+    
+    def refresh_rule_tree(self):
+        """규칙 트리 새로고침 - 담당자 노드만 다시 만들고 규칙 행은 펼칠 때 생성"""
+        if not hasattr(self, 'rule_tree'):
+            return
         
-        # 우측: 상품 리스트 (남은 공간 전체 활용)
-        right_section = tk.Frame(main_layout, bg=self.colors['card'])
-        right_section.pack(side='left', fill='both', expand=True, padx=(0, 0))
+        open_workers = {work_name for work_name, iid in self.rule_worker_items.items()
+                        if self.rule_tree.exists(iid) and self.rule_tree.item(iid, 'open')}
         
-        # 리스트 헤더 (더 명확하게)
-        list_header = tk.Frame(right_section, bg=self.colors['card'])
-        list_header.pack(fill='x', padx=20, pady=(15, 10))
+        self.rule_tree.delete(*self.rule_tree.get_children())
+        self.rule_worker_items = {}
+        self.rule_items = {}
         
-        header_left = tk.Frame(list_header, bg=self.colors['card'])
-        header_left.pack(side='left', fill='x', expand=True)
+        for work_name in self.settings['work_order']:
+            work_config = self.settings['work_config'][work_name]
+            if work_config.get('type') != 'product_specific':
+                continue
+            
+            iid = self.rule_tree.insert('', tk.END, text='', values=('', work_config.get('description', ''), ''),
+                                        tags=('worker',))
+            self.rule_worker_items[work_name] = iid
+            self.refresh_worker_rules(work_name, is_open=work_name in open_workers)
         
-        tk.Label(header_left,
-                text="📋 현재 등록된 상품 규칙",
-                font=('SF Pro Display', 14, 'bold'),
-                bg=self.colors['card'],
-                fg=self.colors['text_primary']).pack(side='left')
+        self._apply_rule_filter()
+    
+    def refresh_worker_rules(self, work_name, is_open=None):
+        """한 담당자의 규칙 행만 갱신 (다른 담당자 행은 그대로)"""
+        iid = self.rule_worker_items.get(work_name)
+        if iid is None:
+            return
         
+        work_config = self.settings['work_config'][work_name]
         products = work_config.get('products', [])
-        count_label = tk.Label(header_left,
-                            text=f"({len(products)}개)",
-                            font=('SF Pro Display', 12),
-                            bg=self.colors['card'],
-                            fg=self.colors['neon_green'])
-        count_label.pack(side='left', padx=(10, 0))
-        
-        # 컬럼 헤더 추가 (테이블 형식)
-        column_header = tk.Frame(right_section, bg=self.colors['card'])
-        column_header.pack(fill='x', padx=20, pady=(0, 5))
-        
-        tk.Label(column_header, text="번호", width=5, anchor='w',
-                font=('SF Pro Display', 11, 'bold'),
-                bg=self.colors['card'], fg=self.colors['text_secondary']).pack(side='left')
-        tk.Label(column_header, text="브랜드", width=15, anchor='w',
-                font=('SF Pro Display', 11, 'bold'),
-                bg=self.colors['card'], fg=self.colors['text_secondary']).pack(side='left', padx=(10, 0))
-        tk.Label(column_header, text="상품명", width=40, anchor='w',
-                font=('SF Pro Display', 11, 'bold'),
-                bg=self.colors['card'], fg=self.colors['text_secondary']).pack(side='left', padx=(10, 0))
-        tk.Label(column_header, text="옵션", anchor='w',
-                font=('SF Pro Display', 11, 'bold'),
-                bg=self.colors['card'], fg=self.colors['text_secondary']).pack(side='left', padx=(10, 0))
-        
-        # 상품 리스트 (훨씬 크고 읽기 쉽게)
-        list_frame = tk.Frame(right_section, bg=self.colors['bg_secondary'], 
-                            highlightbackground=self.colors['border'], highlightthickness=1)
-        list_frame.pack(fill='both', expand=True, padx=20, pady=(0, 15))
-        
-        # 스크롤바 포함 리스트박스
-        list_container = tk.Frame(list_frame, bg=self.colors['card'])
-        list_container.pack(fill='both', expand=True, padx=1, pady=1)
-        
-        product_list = tk.Listbox(list_container,
-                                bg=self.colors['card'],
-                                fg=self.colors['text_primary'],
-                                font=('SF Pro Display', 12),  # 폰트 크기 증가
-                                selectbackground=self.colors['neon_green'],
-                                selectforeground=self.colors['bg'],
-                                height=10,  # 높이 증가
-                                bd=0,
-                                highlightthickness=0,
-                                activestyle='none',
-                                selectmode='single')
-        
-        # 리스트 스크롤바 (더 보기 좋게)
-        list_scrollbar = tk.Scrollbar(list_container, orient="vertical", 
-                                    command=product_list.yview, width=16)
-        product_list.configure(yscrollcommand=list_scrollbar.set)
-        
-        product_list.pack(side='left', fill='both', expand=True, padx=(10, 0))
-        list_scrollbar.pack(side='right', fill='y', padx=(0, 5))
-        
-        # 현재 규칙들 추가 (더 구조화된 형태로)
-        for i, product in enumerate(products):
-            brand = product.get('brand', '').ljust(12)[:12] or '(브랜드없음)'
-            product_name = product.get('product_name', '').ljust(35)[:35]
-            order_option = product.get('order_option', 'All')
+        self.rule_tree.item(iid, text=f"{work_config.get('icon', '📦')} {work_name} ({len(products)}개)")
+        
+        for child in self.rule_tree.get_children(iid):
+            self.rule_items.pop(child, None)
+        self.rule_tree.delete(*self.rule_tree.get_children(iid))
+        
+        if is_open is None:
+            is_open = bool(self.rule_tree.item(iid, 'open'))
+        
+        if is_open:
+            self._materialize_worker_rules(work_name)
+            self.rule_tree.item(iid, open=True)
+        elif products:
+            # 펼침 화살표 표시용 자리표시자
+            self.rule_tree.insert(iid, tk.END, text='…', tags=('empty',))
+    
+    def _materialize_worker_rules(self, work_name, indices=None):
+        """담당자 규칙 행 실제 생성 (indices가 주어지면 해당 규칙만)"""
+        iid = self.rule_worker_items[work_name]
+        products = self.settings['work_config'][work_name].get('products', [])
+        
+        if indices is None:
+            indices = range(len(products))
+        
+        for index in indices:
+            product = products[index]
+            item = self.rule_tree.insert(iid, tk.END, text=f"{index + 1:4d}",
+                                         values=(product.get('brand', '') or '(브랜드없음)',
+                                                 product.get('product_name', ''),
+                                                 product.get('order_option', 'All')))
+            self.rule_items[item] = (work_name, index)
+        
+        if not products:
+            self.rule_tree.insert(iid, tk.END, text='',
+                                  values=('', "아직 등록된 상품 규칙이 없습니다. '➕ 규칙 추가'로 시작하세요.", ''),
+                                  tags=('empty',))
+    
+    def _on_rule_tree_open(self, event):
+        """담당자 노드를 펼칠 때 규칙 행 생성 (지연 생성)"""
+        iid = self.rule_tree.focus()
+        work_name = next((name for name, item in self.rule_worker_items.items() if item == iid), None)
+        if work_name is None:
+            return
+        
+        children = self.rule_tree.get_children(iid)
+        if len(children) == 1 and children[0] not in self.rule_items:
+            self.rule_tree.delete(children[0])
+            self._materialize_worker_rules(work_name)
+    
+    def _schedule_rule_filter(self):
+        """검색어 입력 디바운스"""
+        if self._rule_filter_job is not None:
+            self.root.after_cancel(self._rule_filter_job)
+        self._rule_filter_job = self.root.after(150, self._apply_rule_filter)
+    
+    def _apply_rule_filter(self):
+        """검색어로 전체 규칙 필터링 (일치하는 행만 생성)"""
+        self._rule_filter_job = None
+        query = self.rule_search_var.get().strip().lower()
+        
+        if not query:
+            # 필터 해제 시 필터로 생성된 행만 정리
+            if getattr(self, '_rule_filter_active', False):
+                self._rule_filter_active = False
+                for work_name in self.rule_worker_items:
+                    self.refresh_worker_rules(work_name, is_open=False)
+            return
+        
+        self._rule_filter_active = True
+        for work_name, iid in self.rule_worker_items.items():
+            for child in self.rule_tree.get_children(iid):
+                self.rule_items.pop(child, None)
+            self.rule_tree.delete(*self.rule_tree.get_children(iid))
+            
+            products = self.settings['work_config'][work_name].get('products', [])
+            matches = [index for index, product in enumerate(products)
+                       if query in work_name.lower()
+                       or query in f"{product.get('brand', '')} {product.get('product_name', '')} "
+                                   f"{product.get('order_option', 'All')}".lower()]
             
-            # 탭으로 구분된 형식적인 표시
-            display_text = f"{i+1:3d}.  {brand}  {product_name}  [{order_option}]"
-            product_list.insert(tk.END, display_text)
+            if matches:
+                self._materialize_worker_rules(work_name, matches)
+            self.rule_tree.item(iid, open=bool(matches))
+    
+    def _selected_rule(self):
+        """선택된 트리 아이템의 (담당자, 규칙 인덱스) - 담당자 노드면 인덱스 None"""
+        selection = self.rule_tree.selection()
+        if not selection:
+            return None, None
+        
+        iid = selection[0]
+        if iid in self.rule_items:
+            return self.rule_items[iid]
+        
+        for work_name, item in self.rule_worker_items.items():
+            if item == iid:
+                return work_name, None
+        return None, None
+    
+    def create_results_tab(self, results_tab):
+        """분류 결과 탭 생성 (페이지 단위로 현재 페이지 행만 트리에 생성)"""
+        
+        # 헤더
+        header_frame = tk.Frame(results_tab, bg=self.colors['bg_secondary'])
+        header_frame.pack(fill='x', padx=15, pady=15)
+        
+        tk.Label(header_frame,
+                text="분류 결과",
+                font=self.fonts['title'],
+                bg=self.colors['bg_secondary'],
+                fg=self.colors['neon_green']).pack()
+        
+        # 필터/검색/페이지 툴바
+        toolbar = tk.Frame(results_tab, bg=self.colors['panel'])
+        toolbar.pack(fill='x', padx=15, pady=(8, 0))
+        
+        self.result_worker_var = tk.StringVar(value='전체')
+        self.result_worker_combo = ttk.Combobox(toolbar,
+                                               textvariable=self.result_worker_var,
+                                               state='readonly',
+                                               font=self.fonts['body'],
+                                               width=14)
+        self.result_worker_combo.pack(side='left', padx=(15, 10), pady=10)
+        self.result_worker_combo.bind('<<ComboboxSelected>>', lambda e: self._apply_result_filter())
+        
+        tk.Label(toolbar, text="🔎",
+                font=self.fonts['body'],
+                bg=self.colors['panel'],
+                fg=self.colors['text_secondary']).pack(side='left', padx=(0, 5))
+        
+        self.result_search_var = tk.StringVar()
+        tk.Entry(toolbar,
+                textvariable=self.result_search_var,
+                font=self.fonts['body'],
+                bg=self.colors['card'],
+                fg=self.colors['text_primary'],
+                insertbackground=self.colors['neon_green'],
+                bd=0, width=40).pack(side='left', pady=10, ipady=4)
+        self.result_search_var.trace_add('write', lambda *args: self._schedule_result_filter())
+        self._result_filter_job = None
+        
+        btn_config = {
+            'font': ('SF Pro Display', 11),
+            'bd': 0,
+            'padx': 15,
+            'pady': 6,
+            'cursor': 'hand2'
+        }
+        tk.Button(toolbar, text="🔍 분류 설명", bg=self.colors['neon_yellow'], fg=self.colors['bg'],
+                 command=self.explain_selected_result,
+                 **btn_config).pack(side='right', padx=(0, 10), pady=10)
+        tk.Button(toolbar, text="▶", bg=self.colors['neon_blue'], fg=self.colors['bg'],
+                 command=lambda: self._show_result_page(self.result_page + 1),
+                 **btn_config).pack(side='right', padx=(0, 10), pady=10)
+        self.result_page_var = tk.StringVar()
+        tk.Label(toolbar, textvariable=self.result_page_var,
+                font=self.fonts['small'],
+                bg=self.colors['panel'],
+                fg=self.colors['text_secondary']).pack(side='right', padx=10)
+        tk.Button(toolbar, text="◀", bg=self.colors['neon_blue'], fg=self.colors['bg'],
+                 command=lambda: self._show_result_page(self.result_page - 1),
+                 **btn_config).pack(side='right', padx=(0, 10), pady=10)
+        
+        # 결과 트리 (규칙 트리와 같은 스타일)
+        tree_frame = tk.Frame(results_tab, bg=self.colors['card'])
+        tree_frame.pack(fill='both', expand=True, padx=15, pady=8)
+        
+        columns = [('row', '행', 70), ('담당자', '담당자', 120), ('주문고유번호', '주문번호', 150),
+                   ('상품명', '상품명', 420), ('주문선택사항', '옵션', 200), ('주문수량', '수량', 60),
+                   ('분류근거', '분류근거', 200)]
+        self.result_tree = ttk.Treeview(tree_frame,
+                                       columns=[key for key, _, _ in columns],
+                                       show='headings',
+                                       style='Rules.Treeview',
+                                       selectmode='browse')
+        for key, text, width in columns:
+            self.result_tree.heading(key, text=text, anchor='w')
+            self.result_tree.column(key, width=width, stretch=(key == '상품명'))
+        
+        tree_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.result_tree.yview)
+        self.result_tree.configure(yscrollcommand=tree_scrollbar.set)
+        self.result_tree.pack(side='left', fill='both', expand=True)
+        tree_scrollbar.pack(side='right', fill='y')
+        self.result_tree.bind('<Double-1>', lambda e: self.explain_selected_result())
+        
+        self.result_page = 0
+        self.result_rows = None
+        self.refresh_result_grid()
+    
+    def refresh_result_grid(self):
+        """새 분류 결과로 결과 탭 갱신 (인덱스는 다음 조회 때 다시 생성)"""
+        self.result_index = None
+        if not hasattr(self, 'result_tree'):
+            return
+        
+        self.result_worker_combo.config(values=['전체'] + list(self.settings['work_order']))
+        if self.result_worker_var.get() not in self.result_worker_combo.cget('values'):
+            self.result_worker_var.set('전체')
+        self._apply_result_filter()
+    
+    def _build_result_index(self, df):
+        """결과 탭 조회용 인덱스 - 담당자/주문번호/상품명을 고유값 코드로 (검색은 고유값에만)"""
+        worker_codes, workers = pd.factorize(df['담당자'])
+        order_codes, orders = pd.factorize(df['주문고유번호'])
+        product_codes, products = pd.factorize(df['full_product_name'])
+        
+        display_columns = ['담당자', '주문고유번호', '상품명', '주문선택사항', '주문수량', '분류근거']
+        return {
+            'worker_codes': worker_codes,
+            'workers': {name: code for code, name in enumerate(workers)},
+            'order_codes': order_codes,
+            'orders': [str(order_id).lower() for order_id in orders],
+            'product_codes': product_codes,
+            'products': [str(name).lower() for name in products],
+            'values': {col: df[col].to_numpy(dtype=object) for col in display_columns}
+        }
+    
+    def _schedule_result_filter(self):
+        """검색어 입력 디바운스"""
+        if self._result_filter_job is not None:
+            self.root.after_cancel(self._result_filter_job)
+        self._result_filter_job = self.root.after(200, self._apply_result_filter)
+    
+    def _apply_result_filter(self):
+        """담당자 필터 + 상품명/주문번호 검색 후 첫 페이지 표시"""
+        self._result_filter_job = None
+        if self.classified_data is None:
+            self.result_rows = None
+            self._show_result_page(0)
+            return
+        
+        if self.result_index is None:
+            self.result_index = self._build_result_index(self.classified_data)
+        index = self.result_index
+        
+        mask = np.ones(len(index['worker_codes']), dtype=bool)
+        worker = self.result_worker_var.get()
+        if worker != '전체':
+            mask &= index['worker_codes'] == index['workers'].get(worker, -2)
+        
+        query = self.result_search_var.get().strip().lower()
+        if query:
+            products = [code for code, name in enumerate(index['products']) if query in name]
+            orders = [code for code, order_id in enumerate(index['orders']) if query in order_id]
+            mask &= np.isin(index['product_codes'], products) | np.isin(index['order_codes'], orders)
+        
+        self.result_rows = np.flatnonzero(mask)
+        self._show_result_page(0)
+    
+    def _show_result_page(self, page, page_size=200):
+        """한 페이지 행만 트리에 생성"""
+        self.result_tree.delete(*self.result_tree.get_children())
+        if self.result_rows is None:
+            self.result_page = 0
+            self.result_page_var.set("분류 결과 없음")
+            return
         
-        # 리스트가 비어있을 때 메시지
-        if len(products) == 0:
-            product_list.insert(tk.END, "     아직 등록된 상품 규칙이 없습니다.")
-            product_list.insert(tk.END, "     왼쪽의 '➕ 규칙 추가' 버튼을 클릭하여 시작하세요.")
-            product_list.config(fg=self.colors['text_muted'])
+        total = len(self.result_rows)
+        page_count = max(1, -(-total // page_size))
+        self.result_page = min(max(page, 0), page_count - 1)
         
-        self.product_frames[work_name] = worker_frame
-        self.product_lists[work_name] = product_list
+        values = self.result_index['values']
+        for position in self.result_rows[self.result_page * page_size:(self.result_page + 1) * page_size]:
+            # 행 번호는 내보낸 엑셀 기준 (헤더 다음 행부터)
+            self.result_tree.insert('', 'end', iid=str(position),
+                                    values=[position + 2] + [values[col][position] for col in values])
+        
+        self.result_page_var.set(f"{self.result_page + 1}/{page_count} 페이지 • {total:,}행")
+    
+    def explain_selected_result(self):
+        """선택한 결과 행의 분류 과정 설명 (합배송/복수주문 판정 + 검사한 규칙별 통과/실패 사유)"""
+        selection = self.result_tree.selection() if hasattr(self, 'result_tree') else ()
+        if not selection or self.classified_data is None:
+            messagebox.showinfo("분류 설명", "설명할 결과 행을 선택해주세요.")
+            return
+        
+        position = int(selection[0])
+        df = self.classified_data
+        row = df.iloc[position]
+        # 매칭은 정규화된 값으로 이루어짐
+        brand, product_name, order_option = row['brand'], row['상품명_정규화'], row['옵션_정규화']
+        
+        # UI 스레드에서 컴파일하지 않도록 이미 컴파일된 규칙으로 설명 (없으면 백그라운드 컴파일 후 다시)
+        settings = self.settings
+        compiled = self.compiled_rules
+        if compiled is None:
+            self._schedule_rule_compile()
+            messagebox.showinfo("분류 설명", "규칙을 컴파일하는 중입니다. 잠시 후 다시 시도해주세요.")
+            return
+        current_version = compiled.hash[:12]
+        
+        lines = [f"주문 {row['주문고유번호']} • 엑셀 {position + 2}행",
+                 f"상품: [{brand}] {row['상품명']} | {row['주문선택사항'] or '(옵션 없음)'}",
+                 f"결과: {row['담당자']} ({row['분류근거']})"]
+        if (product_name, order_option) != (row['상품명'], row['주문선택사항']):
+            lines.append(f"정규화: {product_name} | {order_option or '(옵션 없음)'}")
+        if self.accuracy_metrics.get('rule_version') != current_version:
+            lines.append(f"⚠️ 분류 후 규칙이 바뀌었습니다 (분류 {self.accuracy_metrics.get('rule_version')} → "
+                         f"현재 {current_version}) - 현재 규칙으로 재현합니다")
+        if compiled.hash != CompiledRuleSet.hash_settings(settings):
+            lines.append("⚠️ 방금 편집한 규칙은 아직 컴파일 중이라 반영되지 않았습니다")
+        lines.append("")
+        
+        # 1~2단계: 규칙보다 먼저 적용되는 판정
+        combined_work = self._get_combined_work_name()
+        line_count = int((df['주문고유번호'] == row['주문고유번호']).sum())
+        if combined_work:
+            verdict = "→ 합배송" if line_count >= 2 else "해당 없음"
+            lines.append(f"1. 합배송 ({combined_work}): 주문 줄 수 {line_count} {verdict}")
+        multiple_work = self._get_multiple_work_name()
+        threshold = settings.get('quantity_threshold', 2)
+        if multiple_work:
+            if settings.get('multiple_by_units'):
+                quantity = row['실수량']
+                basis = f"실수량 {quantity} (수량 {row['주문수량']} × {row['옵션개수']}개 × {row['세트배수']}세트)"
+            else:
+                quantity = row['주문수량']
+                basis = f"수량 {quantity}"
+            verdict = "→ 복수주문" if quantity >= threshold else "해당 없음"
+            lines.append(f"2. 복수주문 ({multiple_work}): {basis} (기준 {threshold}) {verdict}")
+        
+        # 3단계: 규칙 매칭 재현
+        trace = compiled.explain(brand, product_name, order_option)
+        candidates = compiled.candidates(brand)
+        scope = f"브랜드 '{brand}' 규칙 + 브랜드 없는 규칙" if brand in compiled.by_brand else "브랜드 없는 규칙만"
+        lines.append(f"3. 규칙 매칭: {scope} {len(candidates)}개 중 {len(trace)}개 검사")
+        for entry, passed, reason in trace:
+            lines.append(f"   {'✅' if passed else '❌'} {entry[0]}  — {reason}")
+        if not trace or not trace[-1][1]:
+            lines.append(f"   → 매칭 없음: {self._get_failed_work_name()}")
+        
+        # 다른 브랜드로 등록되어 검사되지 않은 비슷한 규칙 (의도한 규칙이 빠진 이유)
+        skipped = [rule for rule in compiled.rules
+                   if rule['brand'] and normalize_text(rule['brand']) != brand and
+                   rule['product_name'] not in ('All', '') and normalize_text(rule['product_name']) in product_name]
+        if skipped:
+            lines.append("")
+            lines.append("브랜드가 달라 검사되지 않은 규칙 (상품명은 포함됨)")
+            for rule in skipped[:20]:
+                lines.append(f"   · {CompiledRuleSet.rule_key(rule)}")
+        
+        RuleReportDialog(self.root, "분류 설명", f"{row['담당자']} ← {row['분류근거']}", lines)
     
-    def create_stats_tab(self):
+    def create_stats_tab(self, stats_tab):
         """통계 탭 생성"""
-        stats_tab = tk.Frame(self.notebook, bg=self.colors['bg_secondary'])
-        self.notebook.add(stats_tab, text="📈 통계 분석")
         
         # 메인 컨테이너
         main_container = tk.Frame(stats_tab, bg=self.colors['bg_secondary'])
@@ -1125,9 +2656,12 @@ class PlayAutoOrderClassifierV41:
         self.accuracy_text.insert('1.0', "파일 처리 후 정확도 지표를 확인하세요...")
         self.accuracy_text.config(state='disabled')
         
-        # 하단: 상세 통계
-        stats_card = tk.Frame(main_container, bg=self.colors['panel'])
-        stats_card.pack(fill='both', expand=True)
+        # 하단: 상세 통계 + 규칙 사용 통계 (2열)
+        bottom_layout = tk.Frame(main_container, bg=self.colors['bg_secondary'])
+        bottom_layout.pack(fill='both', expand=True)
+        
+        stats_card = tk.Frame(bottom_layout, bg=self.colors['panel'])
+        stats_card.pack(side='left', fill='both', expand=True, padx=(0, 10))
         
         # 통계 헤더
         stats_header = tk.Label(stats_card,
@@ -1150,6 +2684,34 @@ class PlayAutoOrderClassifierV41:
         self.stats_text.pack(fill='both', expand=True, padx=1, pady=1)
         self.stats_text.insert('1.0', "데이터 처리를 기다리는 중...")
         self.stats_text.config(state='disabled')
+        
+        # 규칙 사용 통계 (실행 간 누적)
+        rule_card = tk.Frame(bottom_layout, bg=self.colors['panel'])
+        rule_card.pack(side='left', fill='both', expand=True, padx=(10, 0))
+        
+        rule_header = tk.Label(rule_card,
+                              text="⚙️ 규칙 사용 통계",
+                              font=self.fonts['header'],
+                              bg=self.colors['panel'],
+                              fg=self.colors['text_primary'])
+        rule_header.pack(pady=20)
+        
+        rule_frame = tk.Frame(rule_card, bg=self.colors['card'])
+        rule_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+        
+        self.rule_stats_text = tk.Text(rule_frame,
+                                      bg=self.colors['card'],
+                                      fg=self.colors['text_primary'],
+                                      font=self.fonts['mono'],
+                                      bd=0,
+                                      wrap='none')
+        self.rule_stats_text.pack(fill='both', expand=True, padx=1, pady=1)
+        self.rule_stats_text.insert('1.0', self._build_rule_stats_report())
+        self.rule_stats_text.config(state='disabled')
+        
+        # 탭이 만들어지기 전에 처리된 결과 반영
+        if hasattr(self, 'accuracy_metrics'):
+            self._update_statistics()
     
     # 헬퍼 메서드들 (성능 최적화)
     def update_status(self, message):
@@ -1158,6 +2720,9 @@ class PlayAutoOrderClassifierV41:
         
     def refresh_work_list(self):
         """워커 리스트 새로고침"""
+        if not hasattr(self, 'work_listbox'):
+            return
+        
         self.work_listbox.delete(0, tk.END)
         
         for i, work_name in enumerate(self.settings['work_order']):
@@ -1170,6 +2735,9 @@ class PlayAutoOrderClassifierV41:
     
     def update_accuracy_display(self, text):
         """정확도 표시 업데이트"""
+        if not hasattr(self, 'accuracy_text'):
+            return
+        
         self.accuracy_text.config(state='normal')
         self.accuracy_text.delete(1.0, tk.END)
         self.accuracy_text.insert(tk.END, text)
@@ -1177,134 +2745,440 @@ class PlayAutoOrderClassifierV41:
     
     def update_stats_display(self, text):
         """통계 표시 업데이트"""
+        if not hasattr(self, 'stats_text'):
+            return
+        
         self.stats_text.config(state='normal')
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(tk.END, text)
         self.stats_text.config(state='disabled')
     
+    def update_rule_stats_display(self, text):
+        """규칙 사용 통계 표시 업데이트"""
+        if not hasattr(self, 'rule_stats_text'):
+            return
+        
+        self.rule_stats_text.config(state='normal')
+        self.rule_stats_text.delete(1.0, tk.END)
+        self.rule_stats_text.insert(tk.END, text)
+        self.rule_stats_text.config(state='disabled')
+    
     # 파일 선택 및 처리 메서드들
     def select_file(self):
         """파일 선택 (즉시 실행)"""
+        # 처리 중에는 선택 파일/미리보기를 바꾸지 않음 (진행 창이 비모달이라 드롭존이 눌릴 수 있음)
+        if self.processing:
+            self.update_status("⏳ 처리 중에는 파일을 바꿀 수 없습니다")
+            return
+        
         file_path = filedialog.askopenfilename(
             title="엑셀 파일 선택",
-            filetypes=[("엑셀 파일", "*.xlsx *.xls"), ("모든 파일", "*.*")]
+            filetypes=[("주문 파일", "*.xlsx *.xls *.csv *.tsv *.txt"), ("엑셀 파일", "*.xlsx *.xls"),
+                       ("CSV/TSV 파일", "*.csv *.tsv *.txt"), ("모든 파일", "*.*")]
         )
         
-        if file_path:
-            self.selected_file = file_path
-            filename = os.path.basename(file_path)
-            self.file_info_var.set(f"선택됨: {filename}")
-            self.process_button.config(state='normal')
-            self.update_status(f"파일 로드됨: {filename}")
+        if not file_path:
+            return
+        
+        filename = os.path.basename(file_path)
+        
+        # 앞부분만 읽어서 헤더 행 찾기 + 필수 컬럼 검증 (전체 로드 전에 바로 확인)
+        try:
+            rows = self._read_preview_rows(file_path)
+        except Exception as e:
+            messagebox.showerror("File Error", f"파일을 읽을 수 없습니다:\n{e}")
+            return
+        
+        header_row, profile_name = self._detect_header_row(rows)
+        columns = [str(value).strip() if value is not None else '' for value in rows[header_row]] if rows else []
+        mapping = self._column_mapping(profile_name)
+        missing = [col for col in REQUIRED_COLUMNS if col not in (mapping.get(c, c) for c in columns)]
+        if missing:
+            self.process_button.config(state='disabled')
+            self.file_info_var.set(f"❌ 필수 컬럼 없음: {filename}")
+            
+            # 다른 채널 양식이면 컬럼 매핑 프로필을 만들어 바로 적용
+            if not any(columns) or not messagebox.askyesno(
+                    "Missing Columns",
+                    f"처음 {len(rows)}행에서 필수 컬럼을 찾지 못했습니다: {', '.join(missing)}\n\n"
+                    f"이 양식의 컬럼 매핑 프로필을 만드시겠습니까?"):
+                return
+            profile_name = self._create_column_profile(columns, filename)
+            if profile_name is None:
+                return
+            mapping = self._column_mapping(profile_name)
+        
+        self.selected_file = file_path
+        self.file_preview = {'header_row': header_row, 'columns': columns,
+                             'profile': profile_name, 'mapping': mapping}
+        if file_path.lower().endswith(CSV_EXTENSIONS):
+            self.file_preview['encoding'], self.file_preview['sep'] = self._detect_csv_format(file_path)
+        profile_text = f", 매핑 '{profile_name}'" if profile_name else ''
+        self.file_info_var.set(f"선택됨: {filename}")
+        self.process_button.config(state='normal')
+        self.update_status(f"파일 로드됨: {filename} (헤더 {header_row + 1}행{profile_text})")
+        self._show_file_preview(filename, header_row, [mapping.get(c, c) for c in columns],
+                                rows[header_row + 1:], profile_name)
+    
+    def _read_preview_rows(self, file_path, max_rows=30):
+        """첫 시트의 앞부분 행만 읽기 (xlsx는 읽기 전용 스트리밍, CSV는 앞부분 바이트만)"""
+        if file_path.lower().endswith(CSV_EXTENSIONS):
+            encoding, sep = self._detect_csv_format(file_path)
+            with open(file_path, 'r', encoding=encoding, errors='replace', newline='') as f:
+                rows = []
+                for row in csv.reader(f, delimiter=sep):
+                    rows.append(tuple(value if value != '' else None for value in row))
+                    if len(rows) >= max_rows:
+                        break
+            return rows
+        
+        if file_path.lower().endswith('.xls'):
+            import xlrd
+            book = xlrd.open_workbook(file_path, on_demand=True)
+            try:
+                sheet = book.sheet_by_index(0)
+                return [tuple(sheet.row_values(i)) for i in range(min(max_rows, sheet.nrows))]
+            finally:
+                book.release_resources()
+        
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            return [row for row in sheet.iter_rows(max_row=max_rows, values_only=True)]
+        finally:
+            workbook.close()
+    
+    def _detect_csv_format(self, file_path):
+        """CSV 인코딩과 구분자 추정 - (encoding, sep)"""
+        return detect_csv_format(file_path)
+    
+    def _read_order_file(self, file_path, header_row, dtypes=None, csv_format=None):
+        """주문 파일 전체 로드 (헤더 행부터, 이름 있는 컬럼만)"""
+        return read_order_file(file_path, header_row, dtypes, csv_format)
+    
+    def _detect_header_row(self, rows):
+        """헤더 행과 적용할 컬럼 매핑 프로필 - (행 번호, 프로필 이름 또는 None)
+
+        필수 컬럼이 (프로필 매핑 후) 모두 있는 첫 행, 없으면 알려진 컬럼이 가장 많은(같으면 가장 넓은) 행.
+        """
+        known = set(REQUIRED_COLUMNS) | set(TEXT_COLUMNS)
+        for profile in self.settings.get('column_profiles', {}).values():
+            known.update(profile.get('mapping', {}))
+        
+        best_row, best_score = 0, (0, 0)
+        for i, row in enumerate(rows):
+            cells = [str(value).strip() for value in row if value is not None and str(value).strip()]
+            profile_name = self._match_column_profile(cells)
+            mapping = self._column_mapping(profile_name)
+            if set(REQUIRED_COLUMNS) <= {mapping.get(cell, cell) for cell in cells}:
+                return i, profile_name
+            # 알려진 컬럼 수, 같으면 채워진 칸 수 (제목 행보다 헤더 행이 넓음)
+            score = (len(set(cells) & known), len(cells))
+            if score > best_score:
+                best_row, best_score = i, score
+        return best_row, None
+    
+    def _header_fingerprint(self, columns):
+        """헤더 지문 - 이름 있는 컬럼 집합의 해시 (열 순서 무관)"""
+        names = sorted({str(col).strip() for col in columns if col is not None and str(col).strip()})
+        return hashlib.sha1('\x1f'.join(names).encode('utf-8')).hexdigest()[:12]
+    
+    def _match_column_profile(self, columns):
+        """헤더에 맞는 컬럼 매핑 프로필 이름 (지문 일치 우선, 없으면 원본 컬럼이 모두 있는 프로필 중 가장 구체적인 것)"""
+        profiles = self.settings.get('column_profiles', {})
+        if not profiles:
+            return None
+        
+        fingerprint = self._header_fingerprint(columns)
+        for name, profile in profiles.items():
+            if profile.get('fingerprint') == fingerprint:
+                return name
+        
+        present = set(columns)
+        candidates = [(len(profile.get('mapping', {})), name) for name, profile in profiles.items()
+                      if profile.get('mapping') and set(profile['mapping']) <= present]
+        return max(candidates)[1] if candidates else None
+    
+    def _column_mapping(self, profile_name):
+        """프로필의 {원본 컬럼: 표준 컬럼} 매핑 (프로필 없으면 빈 매핑)"""
+        if not profile_name:
+            return {}
+        return dict(self.settings.get('column_profiles', {}).get(profile_name, {}).get('mapping', {}))
+    
+    def _create_column_profile(self, columns, filename):
+        """파일 헤더로 새 컬럼 매핑 프로필 생성 후 저장 (취소 시 None)"""
+        dialog = ColumnMappingDialog(self.root, [col for col in columns if col],
+                                     REQUIRED_COLUMNS + [col for col in TEXT_COLUMNS if col not in REQUIRED_COLUMNS],
+                                     os.path.splitext(filename)[0])
+        if not dialog.result:
+            return None
+        
+        name, mapping = dialog.result
+        self.settings.setdefault('column_profiles', {})[name] = {
+            'mapping': mapping,
+            'fingerprint': self._header_fingerprint(columns)
+        }
+        self.save_settings()
+        self.update_status(f"✅ 컬럼 매핑 프로필 저장: {name}")
+        return name
+    
+    def _show_file_preview(self, filename, header_row, columns, data_rows, profile_name=None, limit=5):
+        """상세 결과 영역에 헤더와 앞부분 주문 미리보기 (columns는 매핑 후 이름)"""
+        shown = [col for col in REQUIRED_COLUMNS + TEXT_COLUMNS if col in columns]
+        shown = list(OrderedDict.fromkeys(shown))
+        positions = [columns.index(col) for col in shown]
+        
+        preview = f"📄 {filename}\n"
+        preview += f"헤더: {header_row + 1}행 • 컬럼 {len([col for col in columns if col])}개"
+        preview += f" • 매핑 프로필: {profile_name}\n" if profile_name else "\n"
+        preview += f"{'='*40}\n\n"
+        for row in data_rows[:limit]:
+            values = [row[i] if i < len(row) and row[i] is not None else '' for i in positions]
+            preview += " | ".join(f"{col}: {value}" for col, value in zip(shown, values)) + "\n"
+        preview += "\n▶ Process 버튼을 눌러 분류를 시작하세요."
+        
+        self.result_text.config(state='normal')
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, preview)
+        self.result_text.config(state='disabled')
     
     def process_excel(self):
         """엑셀 파일 처리 (고성능 최적화)"""
+        if self.processing:
+            return
         if not hasattr(self, 'selected_file'):
             messagebox.showerror("Error", "Please select a file first")
             return
         
         # 버튼 비활성화
+        self.processing = True
         self.process_button.config(state='disabled')
         self.download_button.config(state='disabled')
+        self.invoice_button.config(state='disabled')
         self.review_button.config(state='disabled')
         
-        # 프로그레스 다이얼로그
-        self.progress_dialog = FastProgressDialog(self.root, "⚡ Ultra Fast Processing...")
+        # 프로그레스 다이얼로그 (처리 중에도 규칙 편집 가능하도록 비모달)
+        self.progress_dialog = FastProgressDialog(self.root, "⚡ Ultra Fast Processing...", modal=False)
+        
+        # 현재 규칙을 고정한 스냅샷으로 분류 (UI 스레드에서 생성)
+        snapshot = self._take_rule_snapshot()
         
-        # 백그라운드 처리
-        thread = threading.Thread(target=self._process_excel_optimized)
+        # 백그라운드 처리 (파일 경로와 미리보기 정보는 사본으로 넘김 - 스레드에서 self를 읽지 않음)
+        thread = threading.Thread(target=self._process_excel_optimized,
+                                  args=(snapshot, self.selected_file, dict(self.file_preview)))
         thread.daemon = True
         thread.start()
     
-    def _process_excel_optimized(self):
-        """최적화된 엑셀 처리"""
+    def _take_rule_snapshot(self):
+        """현재 설정의 불변 스냅샷 생성 (UI 스레드에서만 호출)"""
+        settings = copy.deepcopy(self.settings)
+        return RuleSetSnapshot(
+            version=CompiledRuleSet.hash_settings(settings)[:12],
+            settings=settings,
+            work_order=tuple(settings['work_order']),
+            quantity_threshold=settings.get('quantity_threshold', 2),
+            failed_work=self._get_failed_work_name(),
+            combined_work=self._get_combined_work_name(),
+            multiple_work=self._get_multiple_work_name(),
+            compiled=None
+        )
+    
+    def _process_excel_optimized(self, snapshot, file_path, preview):
+        """최적화된 엑셀 처리 (preview: 선택 시 찾은 헤더 행/컬럼 매핑/CSV 형식)"""
         try:
             start_time = time.time()
             
+            # 0. 데이터 엔진 (시작 직후면 백그라운드 로드 완료까지 대기)
+            self.update_progress(2, "Loading data engine...", 0)
+            load_data_libs()
+            snapshot = snapshot._replace(compiled=self._get_compiled_rules(snapshot.settings))
+            
             # 1. 파일 로딩 (청크 단위 읽기로 메모리 효율화)
             self.update_progress(5, "Loading file...", 50)
             
-            # 엔진 자동 선택
-            engine = 'xlrd' if self.selected_file.endswith('.xls') else 'openpyxl'
+            # Arrow 문자열 모드면 텍스트 컬럼을 읽을 때부터 Arrow로 (없는 컬럼은 무시됨)
+            mapping = preview['mapping']
+            source_names = {target: source for source, target in mapping.items()}
+            dtype = text_dtype(snapshot.settings.get('arrow_strings', False))
+            read_dtypes = ({source_names.get(col, col): dtype for col in TEXT_COLUMNS}
+                           if dtype is not str else None)
+            
+            # 미리보기에서 찾은 헤더 행부터, 이름 있는 컬럼만 읽기 (빈 서식 열 제외)
+            df = self._read_order_file(file_path, preview['header_row'], read_dtypes,
+                                       (preview.get('encoding'), preview.get('sep')))
             
-            # 청크 단위로 읽기 (대용량 파일 대응)
-            df = pd.read_excel(self.selected_file, engine=engine)
+            # 컬럼 매핑 프로필 적용 (이름만 바꾸고 데이터는 복사하지 않음)
+            if mapping:
+                df.columns = [mapping.get(col, col) for col in df.columns]
             self.excel_data = df
             
             # 필수 컬럼 검증
-            required_columns = ['상품명', '주문수량']
-            missing = [col for col in required_columns if col not in df.columns]
+            missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
             if missing:
                 raise ValueError(f"Missing columns: {', '.join(missing)}")
             
             self.update_progress(10, f"Loaded {len(df)} orders", 100)
             
-            # 2. 전처리 (벡터화 연산)
-            self.update_progress(15, "Preprocessing data...", 0)
-            df = self._preprocess_data_optimized(df)
-            self.update_progress(20, "Preprocessing complete", 100)
-            
-            # 3. 분류 (병렬 처리)
-            self.update_progress(25, "Classifying orders...", 0)
-            classified_df = self._classify_orders_optimized(df)
-            
-            # 4. 정렬 (최적화된 알고리즘)
-            self.update_progress(70, "Sorting results...", 0)
-            sorted_df = self._sort_results_optimized(classified_df)
-            
-            # 5. 통계 계산
-            self.update_progress(85, "Calculating statistics...", 0)
-            self._calculate_statistics(sorted_df)
-            
-            # 6. 완료
-            self.classified_data = sorted_df
-            elapsed_time = time.time() - start_time
-            self.update_progress(100, f"Complete! ({elapsed_time:.1f}s)", 100)
+            self._classify_pipeline(df, snapshot, start_time)
             
             # UI 업데이트
             self.root.after(0, self._process_complete)
             
         except Exception as e:
-            self.root.after(0, lambda: self._process_error(str(e)))
+            error_msg = str(e)
+            self.root.after(0, lambda: self._process_error(error_msg))
     
-    def _preprocess_data_optimized(self, df):
-        """최적화된 데이터 전처리"""
-        # 벡터화 연산 사용
-        df['상품명'] = df['상품명'].fillna('').astype(str)
-        df['주문수량'] = pd.to_numeric(df['주문수량'], errors='coerce').fillna(0).astype(int)
-        
-        # 주문선택사항 처리
-        if '주문선택사항' in df.columns:
-            df['주문선택사항'] = df['주문선택사항'].fillna('').astype(str)
-            df['full_product_name'] = df['상품명'] + ' ' + df['주문선택사항']
-        else:
-            df['주문선택사항'] = ''
-            df['full_product_name'] = df['상품명']
-        
-        # 브랜드 추출 (벡터화)
-        df['brand'] = df['상품명'].str.split(n=1, expand=True)[0].fillna('')
-        
-        # 주문번호 처리
-        if '주문고유번호' in df.columns:
-            df['주문고유번호'] = df['주문고유번호'].fillna('').astype(str)
+    def _reclassify_loaded(self, snapshot):
+        """이미 불러온 주문을 새 스냅샷으로 재분류 (설정 파일 변경 시)"""
+        try:
+            start_time = time.time()
+            snapshot = snapshot._replace(compiled=self._get_compiled_rules(snapshot.settings))
+            self._classify_pipeline(self.excel_data.copy(), snapshot, start_time, record_history=False)
+            self.root.after(0, lambda: self._process_complete(quiet=True))
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda: self._process_error(error_msg))
+    
+    def _classify_pipeline(self, df, snapshot, start_time, record_history=True):
+        """전처리 → 분류 → 정렬 → 통계 (파일 처리와 재분류 공용)"""
+        # 단계별 소요 시간 (전처리에는 정규화 시간이 빠져 있음)
+        timings = {}
+        
+        # 2. 전처리 (벡터화 연산)
+        self.update_progress(15, "Preprocessing data...", 0)
+        started = time.perf_counter()
+        df = self._preprocess_data_optimized(df, text_dtype(snapshot.settings.get('arrow_strings', False)),
+                                             self._brand_trie(snapshot.compiled, snapshot.settings), timings)
+        timings['preprocess'] = time.perf_counter() - started - timings['normalize']
+        self.update_progress(20, "Preprocessing complete", 100)
+        
+        # 증분 모드면 새 주문 + 줄 수가 바뀐 주문만 분류 대상
+        delta_mask = self._delta_mask(df, snapshot) if snapshot.settings.get('delta_mode') else None
+        
+        # 3. 분류 (병렬 처리)
+        self.update_progress(25, "Classifying orders...", 0)
+        started = time.perf_counter()
+        if delta_mask is None:
+            classified_df = self._classify_orders_optimized(df, snapshot)
+            delta_df = None
         else:
-            df['주문고유번호'] = np.arange(len(df)).astype(str)
-        
+            delta_df = self._classify_orders_optimized(df[delta_mask], snapshot)
+            classified_df = pd.concat([self._carry_forward_orders(df[~delta_mask]), delta_df])
+        timings['classify'] = time.perf_counter() - started
+        
+        # 4. 정렬 (최적화된 알고리즘)
+        self.update_progress(70, "Sorting results...", 0)
+        started = time.perf_counter()
+        sorted_df = self._sort_results_optimized(classified_df, snapshot)
+        if delta_df is not None:
+            delta_df = self._sort_results_optimized(delta_df, snapshot)
+        timings['sort'] = time.perf_counter() - started
+        
+        # 5. 통계 계산
+        self.update_progress(85, "Calculating statistics...", 0)
+        self._calculate_statistics(sorted_df, snapshot)
+        self.accuracy_metrics['delta_orders'] = None if delta_df is None else len(delta_df)
+        self.accuracy_metrics['stage_timings'] = timings
+        if record_history:
+            self._record_product_history(sorted_df if delta_df is None else delta_df)
+        # 처리된 주문 기록은 증분 모드에서만 필요 (끄면 매 실행의 그룹 집계/저장 생략)
+        if snapshot.settings.get('delta_mode'):
+            self._update_order_state(sorted_df, snapshot)
+        
+        # 6. 완료
+        self.classified_data = sorted_df
+        self.delta_data = delta_df
+        elapsed_time = time.time() - start_time
+        self.update_progress(100, f"Complete! ({elapsed_time:.1f}s)", 100)
+    
+    def _delta_mask(self, df, snapshot):
+        """증분 분류 대상 행 (새 주문 + 줄 수가 바뀐 주문의 모든 줄) - 전체 재분류가 필요하면 None
+
+        주문에 줄이 추가되면 합배송 여부가 바뀌므로 그 주문의 모든 줄을 다시 분류한다.
+        분류 설정이나 날짜가 바뀌었거나 주문고유번호가 없는 파일(행 위치로 만든 번호)이면
+        이전 분류를 믿을 수 없어 전체를 분류한다.
+        """
+        if df.attrs.get('synthetic_order_ids'):
+            return None
+        
+        state = self.order_state
+        today = datetime.now().strftime('%Y-%m-%d')
+        if state.get('state_key') != self._order_state_key(snapshot) or state.get('date') != today:
+            return None
+        
+        known = state.get('orders', {})
+        line_counts = df['주문고유번호'].value_counts()
+        
+        # 줄 수가 같고 담당자가 하나로 정해진 주문만 이전 결과 재사용
+        unchanged = [order_id for order_id, count in line_counts.items()
+                     if order_id in known and known[order_id][0] == count and known[order_id][1] is not None]
+        return (~df['주문고유번호'].isin(unchanged)).to_numpy()
+    
+    def _carry_forward_orders(self, df):
+        """변경 없는 주문은 이전 분류 결과 그대로"""
+        df = df.copy()
+        workers = {order_id: worker for order_id, (_, worker) in self.order_state['orders'].items()}
+        df['담당자'] = df['주문고유번호'].map(workers)
+        df['분류근거'] = '이전 분류'
+        df['신뢰도'] = 1.0
         return df
     
-    def _classify_orders_optimized(self, df):
+    def _update_order_state(self, df, snapshot):
+        """처리된 주문 기록 갱신 - {주문고유번호: [줄 수, 담당자(줄마다 다르면 None)]}"""
+        groups = df.groupby('주문고유번호', sort=False)['담당자']
+        orders = {}
+        for order_id, count, unique, worker in zip(groups.size().index, groups.size(), groups.nunique(),
+                                                   groups.first()):
+            orders[str(order_id)] = [int(count), worker if unique == 1 else None]
+        
+        self.order_state = {
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'state_key': self._order_state_key(snapshot),
+            'orders': orders
+        }
+        self.save_order_state()
+    
+    def _order_state_key(self, snapshot):
+        """이전 분류 재사용 조건 - 규칙 버전 + 규칙 밖에서 분류를 바꾸는 설정 (복수주문 기준, 브랜드 별칭)"""
+        payload = json.dumps([snapshot.version,
+                              snapshot.quantity_threshold,
+                              snapshot.settings.get('multiple_by_units', False),
+                              snapshot.settings.get('brand_aliases', {})],
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+    
+    def _preprocess_data_optimized(self, df, dtype=str, brands=None, timings=None):
+        """최적화된 데이터 전처리"""
+        return preprocess_orders(df, dtype, brands, timings)
+    
+    def _brand_trie(self, compiled, settings):
+        """규칙 브랜드 + 별칭 + 기록된 브랜드로 만든 BrandTrie (구성이 같으면 상품명 캐시째 재사용)"""
+        aliases = settings.get('brand_aliases', {})
+        observed = {entry.get('brand', '') for options in self.product_history.values()
+                    for entry in options.values()}
+        signature = (tuple(sorted(compiled.by_brand)), tuple(sorted(aliases.items())), frozenset(observed))
+        
+        trie = getattr(self, 'brand_trie', None)
+        if trie is None or self.brand_trie_signature != signature:
+            trie = BrandTrie(signature[0], aliases, sorted(observed))
+            self.brand_trie, self.brand_trie_signature = trie, signature
+        return trie
+    
+    def _classify_orders_optimized(self, df, snapshot):
         """최적화된 주문 분류"""
         total_rows = len(df)
         df = df.copy()
         
         # 기본값 설정
-        failed_work = self._get_failed_work_name()
+        failed_work = snapshot.failed_work
         df['담당자'] = failed_work
         df['분류근거'] = '매칭 없음'
         df['신뢰도'] = 0.0
         
-        # 설정값
-        quantity_threshold = self.settings.get('quantity_threshold', 2)
+        # 설정값 (복수주문 기준: 주문수량 또는 옵션을 반영한 실수량)
+        quantity_threshold = snapshot.quantity_threshold
+        quantity_column = '실수량' if snapshot.settings.get('multiple_by_units') else '주문수량'
         
         # 1. 합배송 판별 (벡터화)
         if '주문고유번호' in df.columns:
@@ -1312,100 +3186,381 @@ class PlayAutoOrderClassifierV41:
             multi_orders = order_counts[order_counts >= 2].index
             is_multi_order = df['주문고유번호'].isin(multi_orders)
             
-            combined_work = self._get_combined_work_name()
+            combined_work = snapshot.combined_work
             if combined_work:
                 df.loc[is_multi_order, '담당자'] = combined_work
                 df.loc[is_multi_order, '분류근거'] = '합배송'
                 df.loc[is_multi_order, '신뢰도'] = 1.0
         
         # 2. 복수주문 판별 (벡터화)
-        multiple_work = self._get_multiple_work_name()
+        multiple_work = snapshot.multiple_work
         if multiple_work:
-            is_multiple = (df['주문수량'] >= quantity_threshold) & (df['담당자'] == failed_work)
+            is_multiple = (df[quantity_column] >= quantity_threshold) & (df['담당자'] == failed_work)
             df.loc[is_multiple, '담당자'] = multiple_work
             df.loc[is_multiple, '분류근거'] = '복수주문'
             df.loc[is_multiple, '신뢰도'] = 1.0
         
-        # 3. 상품별 매칭 (최적화)
+        # 3. 상품별 매칭 (컴파일된 규칙, 고유 상품 키 단위)
         unmatched_mask = df['담당자'] == failed_work
-        unmatched_indices = df[unmatched_mask].index
+        unmatched_indices = df.index[unmatched_mask]
+        
+        compiled = snapshot.compiled
+        rule_stats = compiled.new_stats()
         
         if len(unmatched_indices) > 0:
-            # 규칙 사전 컴파일
-            compiled_rules = self._compile_matching_rules()
+            # 같은 브랜드/상품명/옵션 조합은 한 번만 매칭
+            keys = pd.MultiIndex.from_frame(df.loc[unmatched_mask, ['brand', '상품명_정규화', '옵션_정규화']])
+            codes, uniques = keys.factorize()
+            counts = np.bincount(codes, minlength=len(uniques))
+            results = self._match_keys(compiled, uniques, counts, rule_stats, snapshot.settings)
             
-            # 배치 처리
-            batch_size = 1000
-            for i in range(0, len(unmatched_indices), batch_size):
-                batch_indices = unmatched_indices[i:i+batch_size]
-                self._classify_batch(df, batch_indices, compiled_rules)
-                
-                # 진행률 업데이트
-                progress = 25 + (i / len(unmatched_indices)) * 45
-                self.update_progress(progress, f"Classifying... {i}/{len(unmatched_indices)}", 
-                                   (i % batch_size) / batch_size * 100)
+            # 결과를 행 단위로 펼쳐서 한 번에 반영
+            key_matched = np.array([entry is not None for entry in results], dtype=bool)
+            key_works = np.array([entry[1] if entry else failed_work for entry in results], dtype=object)
+            key_reasons = np.array([entry[4] if entry else '매칭 없음' for entry in results], dtype=object)
+            
+            matched = key_matched[codes]
+            matched_indices = unmatched_indices[matched]
+            df.loc[matched_indices, '담당자'] = key_works[codes][matched]
+            df.loc[matched_indices, '분류근거'] = key_reasons[codes][matched]
+            df.loc[matched_indices, '신뢰도'] = 1.0
+        
+        self._record_rule_telemetry(df, rule_stats, snapshot.version)
         
         return df
     
-    def _compile_matching_rules(self):
-        """매칭 규칙 사전 컴파일 (성능 향상)"""
-        rules = []
-        for work_name in self.settings['work_order']:
-            work_config = self.settings['work_config'][work_name]
-            if work_config.get('type') != 'product_specific':
-                continue
+    def _match_keys(self, compiled, uniques, counts, rule_stats, settings):
+        """고유 키별 매칭 항목 목록 (키가 많으면 멀티코어)"""
+        workers = settings.get('parallel_workers', 0) or os.cpu_count() or 1
+        if workers > 1 and len(uniques) >= settings.get('parallel_min_keys', 20000):
+            try:
+                return self._match_keys_parallel(compiled, uniques, counts, rule_stats, workers,
+                                                 settings.get('matcher_engine', 'interpreted'))
+            except Exception as e:
+                # 프로세스 생성 실패 등 - 단일 프로세스로 계속
+                print(f"멀티코어 매칭 오류, 단일 처리로 전환: {e}")
+                for stats in rule_stats.values():
+                    stats[:] = [0, 0, 0.0]
+        
+        match, finish = compiled.matcher(rule_stats, settings.get('matcher_engine', 'interpreted'))
+        results = [None] * len(uniques)
+        for k, (brand, product_name, order_option) in enumerate(uniques):
+            results[k] = match(brand, product_name, order_option, int(counts[k]))
             
-            for product in work_config.get('products', []):
-                rules.append({
-                    'work_name': work_name,
-                    'brand': product.get('brand', ''),
-                    'product_name': product.get('product_name', ''),
-                    'order_option': product.get('order_option', 'All')
-                })
-        return rules
+            # 진행률 업데이트
+            if k % 1000 == 0:
+                progress = 25 + (k / len(uniques)) * 45
+                self.update_progress(progress, f"Classifying... {k}/{len(uniques)} products",
+                                   k / len(uniques) * 100)
+        finish()
+        return results
     
-    def _classify_batch(self, df, indices, rules):
-        """배치 단위 분류"""
-        for idx in indices:
-            row = df.loc[idx]
+    def _match_keys_parallel(self, compiled, uniques, counts, rule_stats, workers, engine):
+        """고유 키를 구간으로 나눠 프로세스 풀에서 매칭
+
+        키 문자열은 UTF-8 바이트 + 오프셋 배열로, 행 수와 결과는 배열로 공유 메모리에 두고
+        워커에는 구간 번호만 보낸다 (DataFrame을 피클하지 않음).
+        """
+        key_count = len(uniques)
+        parts = [field.encode('utf-8') for key in uniques for field in key]
+        offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, parts), dtype=np.int64, count=len(parts)), out=offsets[1:])
+        blob = b''.join(parts)
+        del parts
+        
+        blocks = []
+        try:
+            for size in (len(blob), offsets.nbytes, key_count * 8, key_count * 4):
+                blocks.append(shared_memory.SharedMemory(create=True, size=max(size, 1)))
+            blocks[0].buf[:len(blob)] = blob
+            np.ndarray(offsets.shape, dtype=np.int64, buffer=blocks[1].buf)[:] = offsets
+            np.ndarray((key_count,), dtype=np.int64, buffer=blocks[2].buf)[:] = counts
+            shared_results = np.ndarray((key_count,), dtype=np.int32, buffer=blocks[3].buf)
+            names = tuple(block.name for block in blocks)
             
-            for rule in rules:
-                if self._match_rule(row, rule):
-                    df.at[idx, '담당자'] = rule['work_name']
-                    df.at[idx, '분류근거'] = f"매칭: {rule['brand']} {rule['product_name']}"
-                    df.at[idx, '신뢰도'] = 1.0
-                    break
+            # 구간은 워커 수보다 잘게 나눠 부하 균형 + 진행률 표시
+            shard_size = max(1000, -(-key_count // (workers * 4)))
+            shards = [(start, min(start + shard_size, key_count)) for start in range(0, key_count, shard_size)]
+            
+            done = 0
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_match_worker,
+                                     initargs=(compiled, engine)) as pool:
+                futures = {pool.submit(_match_shard, names, key_count, start, stop): stop - start
+                           for start, stop in shards}
+                for future in as_completed(futures):
+                    for key, (evaluated, hits, seconds) in future.result().items():
+                        stats = rule_stats[key]
+                        stats[0] += evaluated
+                        stats[1] += hits
+                        stats[2] += seconds
+                    
+                    done += futures[future]
+                    self.update_progress(25 + (done / key_count) * 45,
+                                         f"Classifying on {workers} cores... {done}/{key_count} products",
+                                         done / key_count * 100)
+            
+            entries = [compiled.make_entry(rule) for rule in compiled.rules]
+            results = [entries[i] if i >= 0 else None for i in shared_results.tolist()]
+            del shared_results
+            return results
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
+    def _compile_matching_rules(self, settings=None):
+        """매칭 규칙 사전 컴파일 (성능 향상)"""
+        return CompiledRuleSet.rules_from_settings(settings or self.settings)
     
-    def _match_rule(self, row, rule):
-        """규칙 매칭 (최적화)"""
-        # 브랜드 체크
-        if rule['brand'] and rule['brand'] != row['brand']:
+    def _rule_covers(self, outer, inner):
+        """outer 규칙이 inner 규칙에 매칭되는 모든 행을 매칭하는지 여부
+
+        분류기와 같은 정규화된 브랜드/검사 문자열(CompiledRuleSet.make_entry)로 비교한다.
+        """
+        if outer['brand'] and normalize_text(outer['brand']) != normalize_text(inner['brand']):
             return False
-        
-        # 상품명 체크
-        if rule['product_name'] != 'All':
-            if rule['product_name'] not in row['상품명']:
-                return False
-        
-        # 옵션 체크
-        if rule['order_option'] != 'All':
-            if rule['order_option'] not in row['주문선택사항']:
+
+        # 검사 문자열이 None('All'/빈 문자열)이면 모든 값에 매칭됨
+        for field in ('product_name', 'order_option'):
+            outer_check = CompiledRuleSet.check_text(outer[field])
+            if outer_check is None:
+                continue
+            inner_check = CompiledRuleSet.check_text(inner[field])
+            if inner_check is None or outer_check not in inner_check:
                 return False
-        
+
         return True
+
+    def _analyze_rule_set(self):
+        """규칙 정적 분석 - 절대 매칭될 수 없는 규칙 검출
+
+        매칭은 work_order 순으로 평탄화된 규칙 중 첫 매칭에서 멈추므로,
+        앞선 규칙이 뒤 규칙의 매칭 범위를 모두 포함하면 뒤 규칙은 죽은 규칙이다.
+        """
+        findings = []
+        order = 0
+        # 브랜드별 버킷: 앞선 규칙 중 같은 브랜드 또는 브랜드 없음 규칙만 비교
+        buckets = defaultdict(list)
+
+        for rule in self._compile_matching_rules():
+            brand = normalize_text(rule['brand'])
+            candidates = buckets[brand] + buckets[''] if brand else buckets['']
+            covering = [prev for prev in candidates if self._rule_covers(prev, rule)]
+
+            if covering:
+                # 실제로 행을 가져가는 것은 가장 먼저 평가되는 규칙
+                by = min(covering, key=lambda r: r['order'])
+                same_fields = all(by[f] == rule[f] for f in ('brand', 'product_name', 'order_option'))
+                if same_fields:
+                    kind = 'duplicate'
+                elif by['work_name'] != rule['work_name']:
+                    kind = 'shadowed'
+                else:
+                    kind = 'subsumed'
+                findings.append({'kind': kind, 'rule': rule, 'by': by})
+            else:
+                # 죽은 규칙이 포함하는 규칙은 그 규칙을 가린 규칙도 포함하므로 살아있는 규칙만 보관
+                rule['order'] = order
+                order += 1
+                buckets[brand].append(rule)
+
+        return findings
+
+    def _record_rule_telemetry(self, df, rule_stats, rule_version):
+        """이번 실행의 규칙별 평가/매칭/시간을 누적 저장 (파일 크기는 규칙 수 + 최근 실행의 매칭 규칙 수)"""
+        run = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'rule_version': rule_version,
+            'rows': len(df),
+            'workers': {name: int(count) for name, count in df['담당자'].value_counts().items()},
+        }
+        
+        self._add_rule_run(self._ensure_rule_stats(), run, rule_stats)
+        self.save_rule_stats()
     
-    def _sort_results_optimized(self, df):
+    def _record_product_history(self, df):
+        """관측된 상품/옵션 조합 기록 (규칙 압축 검증용)"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        grouped = df.groupby(['상품명', '주문선택사항'], sort=False).agg(
+            brand=('brand', 'first'), work_name=('담당자', 'last'), count=('담당자', 'size'))
+        
+        for (product_name, order_option), brand, work_name, count in zip(
+                grouped.index, grouped['brand'], grouped['work_name'], grouped['count']):
+            entry = self.product_history.setdefault(product_name, {}).setdefault(order_option, {'count': 0})
+            entry['brand'] = brand
+            entry['work_name'] = work_name
+            entry['count'] += int(count)
+            entry['last_seen'] = today
+        
+        self.save_product_history()
+    
+    def _build_rule_stats_report(self):
+        """규칙 사용 통계 리포트 (핫 규칙, 미사용 규칙, 담당자별 커버리지 추이)"""
+        window = self.settings.get('rule_stats_runs', 10)
+        stats = self._ensure_rule_stats()
+        runs = stats['runs'][-window:]
+        if not runs:
+            return "분류를 실행하면 규칙 사용 통계가 누적됩니다..."
+        
+        # 최근 실행의 규칙별 매칭 행수 (실행 기록에는 매칭된 규칙만 있음)
+        recent_hits = defaultdict(int)
+        for run in runs:
+            for key, (evaluated, hits, seconds) in run['rules'].items():
+                recent_hits[key] += hits
+        
+        report = f"RULE USAGE (최근 {len(runs)}회 실행)\n" + "="*50 + "\n\n"
+        
+        report += "🔥 가장 많이 매칭된 규칙\n"
+        hottest = sorted(recent_hits.items(), key=lambda item: item[1], reverse=True)[:10]
+        for key, hits in hottest:
+            report += f"  {hits:>7}건  {key}\n"
+        
+        report += f"\n⏱ 시간을 가장 많이 쓴 규칙 (누적 {stats['run_count']}회)\n"
+        costly = sorted(stats['rules'].items(), key=lambda item: item[1][2], reverse=True)[:5]
+        for key, (evaluated, hits, seconds, _) in costly:
+            report += f"  {seconds*1000:>7.1f}ms  평가 {evaluated}회  {key}\n"
+        
+        # 현재 규칙 중 최근 실행에서 한 번도 매칭되지 않은 규칙 (최근 실행 이후에 추가된 규칙은 제외)
+        report += f"\n💤 최근 {len(runs)}회 매칭 0건 (정리 후보)\n"
+        idle = []
+        for key in (CompiledRuleSet.rule_key(rule) for rule in self._compile_matching_rules()):
+            total = stats['rules'].get(key)
+            if total is None or key in recent_hits:
+                continue
+            present = sum(1 for run in runs if run['seq'] >= total[3])
+            if present:
+                idle.append((key, present))
+        for key, present in idle:
+            report += f"  {key}  ({present}회 실행 중)\n"
+        if not idle:
+            report += "  없음\n"
+        
+        report += "\n📈 담당자별 커버리지 추이\n"
+        for work_name in self.settings['work_order']:
+            trend = [run['workers'].get(work_name, 0) / run['rows'] * 100 if run['rows'] else 0.0
+                     for run in runs]
+            report += f"  {work_name}: " + " → ".join(f"{percent:.0f}%" for percent in trend) + "\n"
+        
+        return report
+
+    def _assign_work(self, compiled, key, rule_stats):
+        """컴파일된 규칙으로 한 상품 (브랜드, 정규화 상품명, 정규화 옵션)의 담당자 (매칭 없으면 None)"""
+        entry = compiled.match(*key, rule_stats)
+        return entry[1] if entry else None
+
+    def _merge_candidates(self, group):
+        """같은 담당자/브랜드 규칙 묶음의 병합 후보 (넓은 것부터)"""
+        options = {rule['order_option'] for rule in group}
+        yield group, 'All', options.pop() if len(options) == 1 else 'All'
+
+        # 상품명 첫 단어가 같은 규칙끼리 공통 단어 접두어로 병합
+        by_head = defaultdict(list)
+        for rule in group:
+            if rule['product_name'] not in ('All', ''):
+                by_head[(rule['product_name'].split()[0], rule['order_option'])].append(rule)
+
+        for (_, order_option), members in by_head.items():
+            if len(members) < 2:
+                continue
+            words = [rule['product_name'].split() for rule in members]
+            prefix = []
+            for column in zip(*words):
+                if len(set(column)) != 1:
+                    break
+                prefix.append(column[0])
+            yield members, ' '.join(prefix), order_option
+
+    def _mine_rule_merges(self):
+        """규칙 압축 후보 탐색
+
+        같은 담당자의 같은 브랜드 규칙 여러 개를 더 넓은 규칙 하나로 바꿔도
+        지금까지 관측된 모든 상품의 담당자가 그대로인 병합만 제안한다.
+        병합은 앞에서부터 누적 적용되며 각 병합은 이전 병합 결과 위에서 검증된다.
+        """
+        current = self._compile_matching_rules()
+        current_set = CompiledRuleSet(current, '')
+        rule_stats = defaultdict(lambda: [0, 0, 0.0])  # 검증용 매칭이라 통계는 버림
+        
+        # 관측 상품을 분류기와 같은 형태로 (정규화 + 브랜드 트리)
+        brands = self._brand_trie(current_set, self.settings)
+        seen_by_brand = defaultdict(list)
+        for product_name, options in self.product_history.items():
+            normalized_name = normalize_text(product_name)
+            brand = brands.brand_of(normalized_name)
+            for order_option in options:
+                seen_by_brand[brand].append((brand, normalized_name, normalize_text(order_option)))
+
+        proposals = []
+
+        for work_name in self.settings['work_order']:
+            groups = defaultdict(list)
+            for rule in current:
+                if rule['work_name'] == work_name and rule['brand']:
+                    groups[normalize_text(rule['brand'])].append(rule)
+
+            for brand, group in groups.items():
+                if len(group) < 2:
+                    continue
+
+                # 브랜드 규칙만 영향을 받으므로 해당 브랜드 관측 상품만 재검증
+                # (관측 상품이 없으면 검증 근거가 없으므로 제안하지 않음)
+                seen = seen_by_brand.get(brand, [])
+                if not seen:
+                    continue
+                merged_ids = set()
+                for members, product_name, order_option in self._merge_candidates(group):
+                    if merged_ids & {id(rule) for rule in members}:
+                        continue
+
+                    merged = {'work_name': work_name, 'brand': members[0]['brand'],
+                              'product_name': product_name, 'order_option': order_option}
+                    member_ids = {id(rule) for rule in members}
+                    first = next(i for i, rule in enumerate(current) if id(rule) in member_ids)
+                    trial = [rule for rule in current[:first] if id(rule) not in member_ids]
+                    trial.append(merged)
+                    trial.extend(rule for rule in current[first:] if id(rule) not in member_ids)
+
+                    trial_set = CompiledRuleSet(trial, '', previous=current_set)
+                    if all(self._assign_work(current_set, key, rule_stats) ==
+                           self._assign_work(trial_set, key, rule_stats) for key in seen):
+                        proposals.append({'work_name': work_name, 'merged': merged,
+                                          'members': members, 'support': len(seen)})
+                        merged_ids |= member_ids
+                        current, current_set = trial, trial_set
+
+                        # 브랜드 전체 병합이 통과하면 더 좁은 후보는 볼 필요 없음
+                        if product_name == 'All':
+                            break
+
+        return proposals, current
+
+    def _apply_flat_rules(self, rules):
+        """평탄화된 규칙 목록을 담당자별 products로 되돌려 저장"""
+        products = defaultdict(list)
+        for rule in rules:
+            products[rule['work_name']].append({
+                'brand': rule['brand'],
+                'product_name': rule['product_name'],
+                'order_option': rule['order_option']
+            })
+
+        for work_name in self.settings['work_order']:
+            work_config = self.settings['work_config'][work_name]
+            if work_config.get('type') == 'product_specific':
+                work_config['products'] = products.get(work_name, [])
+
+    def _sort_results_optimized(self, df, snapshot):
         """최적화된 정렬"""
         # 우선순위 매핑
-        priority_map = {name: i for i, name in enumerate(self.settings['work_order'])}
+        priority_map = {name: i for i, name in enumerate(snapshot.work_order)}
         df['priority'] = df['담당자'].map(priority_map)
         
         # 정렬 키 생성
-        combined_work = self._get_combined_work_name()
+        combined_work = snapshot.combined_work
         
         # 그룹별 정렬
         sorted_groups = []
-        for work_name in self.settings['work_order']:
+        for work_name in snapshot.work_order:
             work_df = df[df['담당자'] == work_name]
             
             if len(work_df) == 0:
@@ -1429,7 +3584,7 @@ class PlayAutoOrderClassifierV41:
         
         return sorted_df
     
-    def _calculate_statistics(self, df):
+    def _calculate_statistics(self, df, snapshot):
         """통계 계산"""
         total_orders = len(df)
         
@@ -1437,7 +3592,7 @@ class PlayAutoOrderClassifierV41:
         self.work_ranges = {}
         work_stats = {}
         
-        for work_name in self.settings['work_order']:
+        for work_name in snapshot.work_order:
             work_data = df[df['담당자'] == work_name]
             count = len(work_data)
             
@@ -1449,7 +3604,7 @@ class PlayAutoOrderClassifierV41:
                     'start': start_row,
                     'end': end_row,
                     'count': count,
-                    'icon': self.settings['work_config'][work_name].get('icon', '📦')
+                    'icon': snapshot.settings['work_config'][work_name].get('icon', '📦')
                 }
                 
                 work_stats[work_name] = {
@@ -1459,11 +3614,12 @@ class PlayAutoOrderClassifierV41:
                 }
         
         # 전체 통계
-        failed_work = self._get_failed_work_name()
+        failed_work = snapshot.failed_work
         unmatched_count = len(df[df['담당자'] == failed_work])
         auto_rate = (total_orders - unmatched_count) / total_orders * 100
         
         self.accuracy_metrics = {
+            'rule_version': snapshot.version,
             'total_orders': total_orders,
             'auto_classification_rate': auto_rate,
             'unmatched_count': unmatched_count,
@@ -1475,25 +3631,35 @@ class PlayAutoOrderClassifierV41:
         if hasattr(self, 'progress_dialog') and not self.progress_dialog.cancelled:
             self.progress_dialog.update(percent, status, sub_percent)
     
-    def _process_complete(self):
-        """처리 완료"""
+    def _process_complete(self, quiet=False):
+        """처리 완료 (quiet: 설정 변경에 따른 재분류 - 알림창 없이 상태바만 갱신)"""
+        self.processing = False
         if hasattr(self, 'progress_dialog'):
             self.progress_dialog.close()
         
         # 결과 표시
         self._display_results()
         self._update_statistics()
+        self.refresh_result_grid()
         
         # 버튼 활성화
         self.process_button.config(state='normal')
         self.download_button.config(state='normal')
+        self.invoice_button.config(state='normal')
         
         if self.accuracy_metrics['unmatched_count'] > 0:
             self.review_button.config(state='normal')
         
         # 상태 업데이트
         auto_rate = self.accuracy_metrics['auto_classification_rate']
-        self.update_status(f"✅ Complete! Auto-classification: {auto_rate:.1f}%")
+        if quiet:
+            self.update_status(f"🔄 새 규칙으로 재분류 완료 (규칙 버전 {self.accuracy_metrics['rule_version']}) "
+                               f"Auto-classification: {auto_rate:.1f}%")
+            return
+        timings = self.accuracy_metrics.get('stage_timings', {})
+        stages = " • ".join(f"{self.STAGE_LABELS.get(stage, stage)} {seconds * 1000:.0f}ms"
+                            for stage, seconds in timings.items())
+        self.update_status(f"✅ Complete! Auto-classification: {auto_rate:.1f}%" + (f" ({stages})" if stages else ""))
         
         if auto_rate == 100:
             messagebox.showinfo("Perfect!", 
@@ -1502,6 +3668,7 @@ class PlayAutoOrderClassifierV41:
     
     def _process_error(self, error_msg):
         """처리 오류"""
+        self.processing = False
         if hasattr(self, 'progress_dialog'):
             self.progress_dialog.close()
         
@@ -1526,7 +3693,10 @@ class PlayAutoOrderClassifierV41:
         title_label.pack(anchor='w')
         
         # 요약 정보
-        summary_text = f"총 {metrics['total_orders']}건 • 성공 {metrics['total_orders'] - metrics['unmatched_count']}건 • 검토필요 {metrics['unmatched_count']}건"
+        summary_text = (f"총 {metrics['total_orders']}건 • 성공 {metrics['total_orders'] - metrics['unmatched_count']}건 • "
+                        f"검토필요 {metrics['unmatched_count']}건 • 규칙 버전 {metrics['rule_version']}")
+        if metrics.get('delta_orders') is not None:
+            summary_text += f" • 🔁 신규/변경 {metrics['delta_orders']}건"
         summary_label = tk.Label(self.summary_frame,
                                 text=summary_text,
                                 font=self.fonts['body'],
@@ -1566,6 +3736,7 @@ class PlayAutoOrderClassifierV41:
 Total Orders Processed: {metrics['total_orders']}
 Successfully Classified: {metrics['total_orders'] - metrics['unmatched_count']}
 Manual Review Needed: {metrics['unmatched_count']}
+Rule Set Version: {metrics['rule_version']}
 
 {'🏆 PERFECT SCORE!' if metrics['auto_classification_rate'] == 100 else '💡 Add more rules to improve accuracy'}"""
         
@@ -1581,27 +3752,20 @@ Manual Review Needed: {metrics['unmatched_count']}
                 stats_text += f"  Confidence: {work_stats['avg_confidence']:.1%}\n\n"
         
         self.update_stats_display(stats_text)
+        # 통계 탭을 연 적이 없으면 리포트를 만들지 않음
+        if hasattr(self, 'rule_stats_text'):
+            self.update_rule_stats_display(self._build_rule_stats_report())
     
     # 나머지 헬퍼 메서드들
-    def edit_selected_rule(self, work_name):
+    def edit_selected_rule(self):
         """선택된 규칙 수정"""
-        product_list = self.product_lists.get(work_name)
-        if not product_list:
-            return
-            
-        selection = product_list.curselection()
-        if not selection:
+        work_name, selected_idx = self._selected_rule()
+        if selected_idx is None:
             messagebox.showwarning("선택 필요", "수정할 규칙을 선택해주세요")
             return
         
         # 선택된 인덱스에서 실제 상품 정보 가져오기
-        selected_idx = selection[0]
-        work_config = self.settings['work_config'][work_name]
-        products = work_config.get('products', [])
-        
-        if selected_idx >= len(products):
-            return
-            
+        products = self.settings['work_config'][work_name].get('products', [])
         product = products[selected_idx]
         
         dialog = ProductRuleDialog(self.root, work_name, mode='edit', 
@@ -1619,37 +3783,36 @@ Manual Review Needed: {metrics['unmatched_count']}
                 'order_option': dialog.result['order_option']
             }
             
-            # 리스트 새로고침
-            self.refresh_product_frames()
+            # 바뀐 행만 갱신
+            item = self.rule_tree.selection()[0]
+            self.rule_tree.item(item, values=(dialog.result['brand'] or '(브랜드없음)',
+                                              dialog.result['product_name'],
+                                              dialog.result['order_option']))
 
-    def delete_selected_rule(self, work_name):
+    def delete_selected_rule(self):
         """선택된 규칙 삭제"""
-        product_list = self.product_lists.get(work_name)
-        if not product_list:
-            return
-            
-        selection = product_list.curselection()
-        if not selection:
+        work_name, selected_idx = self._selected_rule()
+        if selected_idx is None:
             messagebox.showwarning("선택 필요", "삭제할 규칙을 선택해주세요")
             return
         
-        selected_idx = selection[0]
-        work_config = self.settings['work_config'][work_name]
-        products = work_config.get('products', [])
-        
-        if selected_idx >= len(products):
-            return
-            
         # 삭제 확인
-        product = products[selected_idx]
-        product_name = product.get('product_name', '규칙')
+        products = self.settings['work_config'][work_name].get('products', [])
+        product_name = products[selected_idx].get('product_name', '규칙')
         
         if messagebox.askyesno("삭제 확인", f"'{product_name}' 규칙을 삭제하시겠습니까?"):
             # 상품 리스트에서 제거
             products.pop(selected_idx)
             
-            # 리스트 새로고침
-            self.refresh_product_frames()
+            # 번호가 바뀌므로 해당 담당자 행만 갱신
+            self._rules_changed(work_name)
+
+    def _rules_changed(self, work_name):
+        """한 담당자의 규칙이 바뀐 뒤 트리 갱신 (검색 중이면 필터 재적용)"""
+        if self.rule_search_var.get().strip():
+            self._apply_rule_filter()
+        else:
+            self.refresh_worker_rules(work_name)
 
     def _get_failed_work_name(self):
         """실패 담당자명"""
@@ -1673,73 +3836,227 @@ Manual Review Needed: {metrics['unmatched_count']}
         return None
     
     # 다이얼로그 메서드들 (간소화)
-    def add_product_rule(self, work_name):
+    def add_product_rule(self):
         """상품 규칙 추가"""
+        work_name, _ = self._selected_rule()
+        if work_name is None:
+            messagebox.showwarning("선택 필요", "규칙을 추가할 담당자를 선택해주세요")
+            return
+        
         dialog = ProductRuleDialog(self.root, work_name, mode='add')
         if dialog.result:
-            product_list = self.product_lists[work_name]
-            rule_text = f"{dialog.result['brand']} | {dialog.result['product_name']} | {dialog.result['order_option']}"
-            product_list.insert(tk.END, rule_text)
+            self.settings['work_config'][work_name].setdefault('products', []).append(dialog.result)
+            self._rules_changed(work_name)
     
-    def edit_product_rule(self, work_name, product_list):
-        """상품 규칙 수정"""
-        selection = product_list.curselection()
-        if not selection:
-            messagebox.showwarning("Selection Required", "Please select a rule to edit")
+    def save_product_settings(self):
+        """상품 설정 저장"""
+        try:
+            # 규칙은 settings에 직접 반영되므로 리스트 텍스트를 다시 파싱하지 않음
+            self.save_settings()
+            self.update_status("✅ Product settings saved successfully")
+            messagebox.showinfo("Success", "Product settings saved!")
+            
+        except Exception as e:
+            messagebox.showerror("Save Error", str(e))
+
+    def analyze_rules(self):
+        """규칙 분석 (가려진/중복/포함된 규칙 검출 및 정리)"""
+        findings = self._analyze_rule_set()
+        if not findings:
+            messagebox.showinfo("규칙 분석", "✅ 매칭될 수 없는 규칙이 없습니다!")
+            return
+
+        kind_labels = {'duplicate': '중복', 'shadowed': '가려짐', 'subsumed': '포함됨'}
+        counts = defaultdict(int)
+        lines = []
+        for i, finding in enumerate(findings, 1):
+            rule, by = finding['rule'], finding['by']
+            counts[finding['kind']] += 1
+            lines.append(f"{i:3d}. [{kind_labels[finding['kind']]}] {rule['work_name']} #{rule['index'] + 1}: "
+                         f"{rule['brand']} | {rule['product_name']} | {rule['order_option']}")
+            lines.append(f"       ← {by['work_name']} #{by['index'] + 1}: "
+                         f"{by['brand']} | {by['product_name']} | {by['order_option']}")
+        summary = " • ".join(f"{kind_labels[kind]} {count}개" for kind, count in counts.items())
+
+        dialog = RuleReportDialog(self.root, f"규칙 분석 - 매칭될 수 없는 규칙 {len(findings)}개",
+                                  summary, lines, "🧹 모두 정리",
+                                  "표시된 규칙을 모두 삭제하시겠습니까?\n(분류 결과는 바뀌지 않습니다)")
+        if dialog.result:
+            self._prune_rules(findings)
+
+    def compress_rules(self):
+        """규칙 압축 (관측 데이터 기준 결과가 같은 더 넓은 규칙으로 병합)"""
+        if not self.product_history:
+            messagebox.showinfo("규칙 압축", "분류 기록이 없습니다.\n파일을 먼저 분류하면 관측된 상품으로 병합을 검증합니다.")
+            return
+
+        proposals, merged_rules = self._mine_rule_merges()
+        if not proposals:
+            messagebox.showinfo("규칙 압축", "✅ 안전하게 병합할 수 있는 규칙이 없습니다.")
+            return
+
+        removed = sum(len(p['members']) for p in proposals) - len(proposals)
+        lines = []
+        for i, proposal in enumerate(proposals, 1):
+            merged = proposal['merged']
+            lines.append(f"{i:3d}. {proposal['work_name']}: 규칙 {len(proposal['members'])}개 → "
+                         f"{merged['brand']} | {merged['product_name']} | {merged['order_option']}"
+                         f"  (관측 상품 {proposal['support']}개로 검증)")
+            for rule in proposal['members']:
+                lines.append(f"       - {rule['brand']} | {rule['product_name']} | {rule['order_option']}")
+
+        dialog = RuleReportDialog(self.root, f"규칙 압축 - 병합 제안 {len(proposals)}개",
+                                  f"규칙 {removed}개 감소 (지금까지 분류된 모든 상품의 담당자 동일)",
+                                  lines, "🧩 모두 적용",
+                                  "제안된 병합을 모두 적용하시겠습니까?\n(새 상품은 더 넓은 규칙으로 매칭될 수 있습니다)")
+        if dialog.result:
+            self._apply_flat_rules(merged_rules)
+            self.save_settings()
+            self.refresh_rule_tree()
+            self.update_status(f"✅ 규칙 {removed}개 압축 완료")
+
+    def import_rules(self):
+        """스프레드시트에서 상품 규칙 일괄 가져오기"""
+        file_path = filedialog.askopenfilename(
+            title="규칙 파일 선택",
+            filetypes=[("규칙 파일", "*.xlsx *.xls *.csv"), ("모든 파일", "*.*")]
+        )
+        if not file_path:
             return
         
-        # 기존 규칙 파싱
-        rule_text = product_list.get(selection[0])
-        parts = rule_text.split(' | ')
+        try:
+            load_data_libs()
+            if file_path.lower().endswith('.csv'):
+                incoming = pd.read_csv(file_path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+            else:
+                incoming = pd.read_excel(file_path, dtype=str, keep_default_na=False)
+            
+            new_rules, report = self._validate_rule_import(incoming)
+        except Exception as e:
+            messagebox.showerror("Import Error", str(e))
+            return
         
-        dialog = ProductRuleDialog(self.root, work_name, mode='edit', 
-                                 initial_data={
-                                     'brand': parts[0],
-                                     'product_name': parts[1],
-                                     'order_option': parts[2]
-                                 })
+        for work_name, group in new_rules.groupby('worker', sort=False):
+            self.settings['work_config'][work_name].setdefault('products', []).extend(
+                group[['brand', 'product_name', 'order_option']].to_dict('records'))
         
-        if dialog.result:
-            new_text = f"{dialog.result['brand']} | {dialog.result['product_name']} | {dialog.result['order_option']}"
-            product_list.delete(selection[0])
-            product_list.insert(selection[0], new_text)
+        if len(new_rules) > 0:
+            self.save_settings()
+            self.refresh_rule_tree()
+        
+        self.update_status(f"✅ 규칙 {len(new_rules)}개 가져옴")
+        messagebox.showinfo("규칙 가져오기",
+                            f"추가: {len(new_rules)}개\n"
+                            f"중복 (건너뜀): {report['duplicates']}개\n"
+                            f"충돌 (건너뜀): {report['conflicts']}개\n"
+                            f"오류 (건너뜀): {report['errors']}개"
+                            + ("\n\n충돌 예시:\n" + "\n".join(report['conflict_examples']) if report['conflicts'] else "")
+                            + ("\n\n오류 예시:\n" + "\n".join(report['error_examples']) if report['errors'] else ""))
     
-    def delete_product_rule(self, work_name, product_list):
-        """상품 규칙 삭제"""
-        selection = product_list.curselection()
-        if not selection:
-            messagebox.showwarning("Selection Required", "Please select a rule to delete")
+    def _validate_rule_import(self, incoming):
+        """가져올 규칙 검증/중복 제거/충돌 검출 (DataFrame 연산)"""
+        columns = ['worker', 'brand', 'product_name', 'order_option']
+        key = ['brand', 'product_name', 'order_option']
+        
+        # 한글 헤더도 허용
+        incoming = incoming.rename(columns=lambda c: str(c).strip()).rename(columns={
+            '담당자': 'worker', '브랜드': 'brand', '상품명': 'product_name',
+            '옵션': 'order_option', '주문선택사항': 'order_option'
+        })
+        missing = [col for col in ['worker', 'product_name'] if col not in incoming.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        
+        for col in columns:
+            if col not in incoming.columns:
+                incoming[col] = ''
+        incoming = incoming[columns].fillna('').astype(str).apply(lambda col: col.str.strip())
+        incoming['order_option'] = incoming['order_option'].mask(incoming['order_option'] == '', 'All')
+        
+        # 1. 검증: 상품 규칙 담당자여야 하고 상품명이 있어야 함
+        product_workers = [name for name in self.settings['work_order']
+                           if self.settings['work_config'][name].get('type') == 'product_specific']
+        invalid_worker = ~incoming['worker'].isin(product_workers)
+        invalid_name = incoming['product_name'] == ''
+        invalid = invalid_worker | invalid_name
+        errors = incoming[invalid]
+        error_examples = [f"{row.worker or '(담당자없음)'} | {row.brand} | {row.product_name}: "
+                          f"{'알 수 없는 담당자' if row.worker not in product_workers else '상품명 없음'}"
+                          for row in errors.head(5).itertuples()]
+        incoming = incoming[~invalid]
+        
+        # 2. 중복 제거: 파일 내부 중복 + 이미 등록된 규칙
+        existing = pd.DataFrame(
+            [[rule['work_name'], rule['brand'], rule['product_name'], rule['order_option']]
+             for rule in self._compile_matching_rules()], columns=columns)
+        before = len(incoming)
+        incoming = incoming.drop_duplicates(columns)
+        incoming = incoming.merge(existing, on=columns, how='left', indicator=True)
+        incoming = incoming[incoming['_merge'] == 'left_only'].drop(columns='_merge')
+        duplicates = before - len(incoming)
+        
+        # 3. 충돌: 같은 브랜드/상품명/옵션이 서로 다른 담당자에게 지정됨
+        combined = pd.concat([existing, incoming], ignore_index=True)
+        worker_counts = combined.groupby(key)['worker'].nunique()
+        conflict_keys = worker_counts[worker_counts > 1].index
+        is_conflict = pd.MultiIndex.from_frame(incoming[key]).isin(conflict_keys)
+        conflicts = incoming[is_conflict]
+        conflict_examples = [f"{row.worker} | {row.brand} | {row.product_name} | {row.order_option}"
+                             for row in conflicts.head(5).itertuples()]
+        incoming = incoming[~is_conflict]
+        
+        return incoming, {
+            'duplicates': duplicates,
+            'conflicts': len(conflicts),
+            'errors': len(errors),
+            'conflict_examples': conflict_examples,
+            'error_examples': error_examples
+        }
+    
+    def export_rules(self):
+        """상품 규칙을 스프레드시트로 내보내기"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile=f"rules_{timestamp}.xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+        )
+        if not save_path:
             return
         
-        if messagebox.askyesno("Confirm Delete", "Delete selected rule?"):
-            product_list.delete(selection[0])
-    
-    def save_product_settings(self):
-        """상품 설정 저장"""
         try:
-            # 각 워커의 상품 규칙 수집
-            for work_name, product_list in self.product_lists.items():
-                products = []
-                
-                for i in range(product_list.size()):
-                    rule_text = product_list.get(i)
-                    parts = rule_text.split(' | ')
-                    
-                    products.append({
-                        'brand': parts[0],
-                        'product_name': parts[1],
-                        'order_option': parts[2]
-                    })
-                
-                self.settings['work_config'][work_name]['products'] = products
+            load_data_libs()
+            rules = pd.DataFrame(
+                [[rule['work_name'], rule['brand'], rule['product_name'], rule['order_option']]
+                 for rule in self._compile_matching_rules()],
+                columns=['worker', 'brand', 'product_name', 'order_option'])
             
-            self.save_settings()
-            self.update_status("✅ Product settings saved successfully")
-            messagebox.showinfo("Success", "Product settings saved!")
+            if save_path.lower().endswith('.csv'):
+                # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+                rules.to_csv(save_path, index=False, encoding='utf-8-sig')
+            else:
+                rules.to_excel(save_path, index=False)
             
+            self.update_status(f"✅ 규칙 {len(rules)}개 내보냄: {os.path.basename(save_path)}")
         except Exception as e:
-            messagebox.showerror("Save Error", str(e))
+            messagebox.showerror("Export Error", str(e))
     
+    def _prune_rules(self, findings):
+        """분석 결과의 죽은 규칙 제거"""
+        dead = defaultdict(list)
+        for finding in findings:
+            dead[finding['rule']['work_name']].append(finding['rule']['index'])
+
+        # 인덱스가 밀리지 않도록 뒤에서부터 제거
+        for work_name, indices in dead.items():
+            products = self.settings['work_config'][work_name]['products']
+            for index in sorted(indices, reverse=True):
+                products.pop(index)
+
+        self.save_settings()
+        self.refresh_rule_tree()
+        self.update_status(f"✅ 죽은 규칙 {len(findings)}개 정리 완료")
+
     def download_excel(self):
         """결과 다운로드"""
         if self.classified_data is None:
@@ -1757,19 +4074,175 @@ Manual Review Needed: {metrics['unmatched_count']}
         
         if save_path:
             try:
-                # 내부 컬럼 제거
-                output_cols = [col for col in self.classified_data.columns 
-                             if col not in ['담당자', '분류근거', '신뢰도', 'brand', 'full_product_name', 'priority']]
-                output_data = self.classified_data[output_cols]
+                output_cols = self._export_columns(self.classified_data)
+                
+                # 저장 (증분 모드면 신규/변경 주문 시트 + 누적 시트)
+                if self.delta_data is not None:
+                    sheets = [('신규', self.delta_data), ('누적', self.classified_data)]
+                else:
+                    sheets = [('Sheet1', self.classified_data)]
                 
-                # 저장
-                output_data.to_excel(save_path, index=False)
+                with pd.ExcelWriter(save_path, engine='openpyxl') as writer:
+                    for sheet_name, data in sheets:
+                        data[output_cols].to_excel(writer, sheet_name=sheet_name, index=False)
+                        self._style_export_sheet(writer.sheets[sheet_name], data['담당자'], len(output_cols))
                 self.update_status(f"✅ Saved: {os.path.basename(save_path)}")
                 messagebox.showinfo("Success", "File saved successfully!")
                 
             except Exception as e:
                 messagebox.showerror("Save Error", str(e))
     
+    def _export_columns(self, df):
+        """내보낼 컬럼 - 내부 컬럼 제거, 실수량은 복수주문 기준일 때만, 담당자는 색 띠 기준으로 마지막 열에"""
+        columns = [col for col in df.columns if col not in EXPORT_EXCLUDED_COLUMNS]
+        if self.settings.get('multiple_by_units') and '실수량' in df.columns:
+            columns.append('실수량')
+        return columns + ['담당자']
+    
+    def _style_export_sheet(self, worksheet, workers, column_count):
+        """담당자별 색 띠 + 헤더 고정 + 자동 필터 (마지막 열이 담당자)
+
+        색은 셀마다 스타일을 붙이지 않고 담당자마다 "담당자 열 = 이름" 조건부 서식 하나로
+        지정하므로 행 수가 많아도 저장 시간과 파일 크기가 거의 늘지 않고,
+        엑셀에서 정렬/필터해도 색이 각 행의 담당자를 따라간다.
+        """
+        from openpyxl.formatting.rule import FormulaRule
+        from openpyxl.styles import PatternFill
+        from openpyxl.utils import get_column_letter
+        
+        row_count = len(workers)
+        last_col = get_column_letter(max(column_count, 1))
+        worksheet.freeze_panes = 'A2'
+        worksheet.auto_filter.ref = f"A1:{last_col}{row_count + 1}"
+        if row_count == 0:
+            return
+        
+        work_order = self.settings['work_order']
+        data_range = f"A2:{last_col}{row_count + 1}"
+        for work_name in pd.unique(workers.dropna()):
+            color = self.settings['work_config'].get(work_name, {}).get('color')
+            if color:
+                color = str(color).lstrip('#')  # 설정에는 "#RRGGBB"로 적혀 있을 수 있음
+            else:
+                position = work_order.index(work_name) if work_name in work_order else len(work_order)
+                color = EXPORT_BAND_COLORS[position % len(EXPORT_BAND_COLORS)]
+            fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+            name = str(work_name).replace('"', '""')
+            worksheet.conditional_formatting.add(data_range,
+                                                 FormulaRule(formula=[f'${last_col}2="{name}"'], fill=fill))
+    
+    def join_invoices(self):
+        """택배사 송장 파일을 주문고유번호(설정 가능)로 분류 결과에 병합"""
+        if self.classified_data is None:
+            messagebox.showerror("Error", "No data to match")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            title="송장 파일 선택",
+            filetypes=[("송장 파일", "*.xlsx *.xls *.csv *.tsv *.txt"), ("모든 파일", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        order_key = self.settings.get('invoice_order_key', '주문고유번호')
+        file_key = self.settings.get('invoice_file_key', order_key)
+        
+        try:
+            self.update_status("🚚 송장 파일 읽는 중...")
+            self.root.update_idletasks()
+            invoices = self._read_invoice_file(file_path, file_key)
+            merged, report = self._merge_invoices(self.classified_data, invoices, order_key, file_key)
+        except Exception as e:
+            messagebox.showerror("Invoice Error", str(e))
+            return
+        
+        lines = [f"송장 없는 주문 ({len(report['missing'])}건)"]
+        lines += [f"   {key}" for key in report['missing'][:50]]
+        lines += ["", f"주문에 없는 송장 ({len(report['orphans'])}건)"]
+        lines += [f"   {key}" for key in report['orphans'][:50]]
+        lines += ["", f"중복 송장 키 ({len(report['duplicates'])}건, 첫 행만 사용)"]
+        lines += [f"   {key}" for key in report['duplicates'][:50]]
+        summary = (f"매칭 {report['matched']}건 • 송장 없음 {len(report['missing'])}건 • "
+                   f"주문에 없음 {len(report['orphans'])}건 • 중복 {len(report['duplicates'])}건")
+        self.update_status(f"🚚 송장 매칭: {summary}")
+        
+        dialog = RuleReportDialog(self.root, f"송장 매칭 - {os.path.basename(file_path)}",
+                                  summary, lines, "💾 병합 파일 저장",
+                                  "송장이 병합된 파일을 저장하시겠습니까?")
+        if not dialog.result:
+            return
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            initialfile=f"invoiced_{timestamp}.xlsx",
+            filetypes=[("Excel files", "*.xlsx")]
+        )
+        if not save_path:
+            return
+        
+        try:
+            output_cols = self._export_columns(merged)
+            with pd.ExcelWriter(save_path, engine='openpyxl') as writer:
+                merged[output_cols].to_excel(writer, sheet_name='송장병합', index=False)
+                self._style_export_sheet(writer.sheets['송장병합'], merged['담당자'], len(output_cols))
+                for sheet_name, key_name in (('송장없음', 'missing'), ('주문없음', 'orphans'), ('중복송장', 'duplicates')):
+                    if report[key_name]:
+                        pd.DataFrame({order_key: report[key_name]}).to_excel(writer, sheet_name=sheet_name, index=False)
+            self.update_status(f"✅ Saved: {os.path.basename(save_path)}")
+            messagebox.showinfo("Success", "File saved successfully!")
+        except Exception as e:
+            messagebox.showerror("Save Error", str(e))
+    
+    def _read_invoice_file(self, file_path, file_key):
+        """송장 파일 읽기 (키 컬럼이 있는 행을 헤더로, 키는 문자열로)"""
+        load_data_libs()
+        if file_path.lower().endswith(CSV_EXTENSIONS):
+            encoding, sep = self._detect_csv_format(file_path)
+            invoices = pd.read_csv(file_path, dtype={file_key: str}, encoding=encoding, sep=sep)
+        else:
+            rows = self._read_preview_rows(file_path)
+            header_row = next((i for i, row in enumerate(rows)
+                               if file_key in (str(value).strip() for value in row if value is not None)), 0)
+            invoices = pd.read_excel(file_path, header=header_row, dtype={file_key: str})
+        
+        invoices.columns = [str(col).strip() for col in invoices.columns]
+        if file_key not in invoices.columns:
+            raise ValueError(f"송장 파일에 키 컬럼이 없습니다: {file_key}")
+        return invoices
+    
+    def _merge_invoices(self, orders, invoices, order_key, file_key):
+        """송장 해시 조인 (벡터화) - (병합 결과, 리포트)
+
+        리포트: matched(송장이 붙은 주문 행 수), missing(송장 없는 주문 키),
+        orphans(주문에 없는 송장 키), duplicates(송장 파일에 여러 번 나온 키)
+        """
+        if order_key not in orders.columns:
+            raise ValueError(f"분류 결과에 키 컬럼이 없습니다: {order_key}")
+        
+        invoice_keys = invoices[file_key].fillna('').astype(str).str.strip()
+        invoices = invoices.assign(**{file_key: invoice_keys})[invoice_keys != '']
+        duplicated = invoices[file_key].duplicated(keep='first')
+        duplicates = invoices.loc[duplicated, file_key].unique().tolist()
+        invoices = invoices[~duplicated]
+        
+        # 키 컬럼 이름이 다르면 조인 후 송장 쪽 키 컬럼은 제거
+        left_keys = orders[order_key].astype(str).str.strip()
+        if file_key != order_key:
+            invoices = invoices.rename(columns={file_key: order_key})
+        merged = orders.assign(**{order_key: left_keys}).merge(
+            invoices, on=order_key, how='left', suffixes=('', '_송장'),
+            validate='many_to_one', indicator=True)
+        
+        matched = merged['_merge'] == 'both'
+        report = {
+            'matched': int(matched.sum()),
+            'missing': merged.loc[~matched, order_key].unique().tolist(),
+            'orphans': invoices.loc[~invoices[order_key].isin(left_keys), order_key].tolist(),
+            'duplicates': duplicates
+        }
+        return merged.drop(columns='_merge'), report
+    
     def review_unmatched(self):
         """미분류 검토"""
         if self.accuracy_metrics['unmatched_count'] == 0:
@@ -1803,7 +4276,7 @@ Manual Review Needed: {metrics['unmatched_count']}
             self.settings['work_order'].insert(failed_idx, name)
             
             self.refresh_work_list()
-            self.refresh_product_frames()
+            self.refresh_rule_tree()
             messagebox.showinfo("Success", f"Worker '{name}' added!")
     
     def edit_work_name(self):
@@ -1826,7 +4299,7 @@ Manual Review Needed: {metrics['unmatched_count']}
             self.settings['work_order'][selection[0]] = new_name
             
             self.refresh_work_list()
-            self.refresh_product_frames()
+            self.refresh_rule_tree()
     
     def move_work_up(self):
         """워커 위로 이동"""
@@ -1840,6 +4313,7 @@ Manual Review Needed: {metrics['unmatched_count']}
         
         self.refresh_work_list()
         self.work_listbox.selection_set(idx-1)
+        self.refresh_rule_tree()
     
     def move_work_down(self):
         """워커 아래로 이동"""
@@ -1853,6 +4327,7 @@ Manual Review Needed: {metrics['unmatched_count']}
         
         self.refresh_work_list()
         self.work_listbox.selection_set(idx+1)
+        self.refresh_rule_tree()
     
     def change_work_icon(self):
         """워커 아이콘 변경"""
@@ -1868,7 +4343,7 @@ Manual Review Needed: {metrics['unmatched_count']}
         if new_icon:
             self.settings['work_config'][work_name]['icon'] = new_icon
             self.refresh_work_list()
-            self.refresh_product_frames()
+            self.refresh_rule_tree()
     
     def edit_work_description(self):
         """워커 설명 수정"""
@@ -1884,6 +4359,7 @@ Manual Review Needed: {metrics['unmatched_count']}
         if new_desc is not None:
             self.settings['work_config'][work_name]['description'] = new_desc
             self.refresh_work_list()
+            self.refresh_rule_tree()
     
     def delete_work(self):
         """워커 삭제"""
@@ -1902,7 +4378,7 @@ Manual Review Needed: {metrics['unmatched_count']}
             self.settings['work_order'].remove(work_name)
             
             self.refresh_work_list()
-            self.refresh_product_frames()
+            self.refresh_rule_tree()
     
     def save_work_changes(self):
         """워커 변경사항 저장"""
@@ -1915,8 +4391,43 @@ Manual Review Needed: {metrics['unmatched_count']}
     
     def run(self):
         """앱 실행"""
-        self.show_splash_screen()
+        self.root.after_idle(self.on_ready)
         self.root.mainloop()
+        
+        # 아직 쓰지 않은 설정/기록 저장
+        self.settings_writer.flush()
+    
+    def on_ready(self):
+        """UI 준비 완료 - 스플래시를 닫고 pandas/numpy는 백그라운드에서 로드"""
+        self.splash.destroy()
+        self.root.deiconify()
+        self.ui_ready_ms = (time.perf_counter() - self.startup_started) * 1000
+        
+        self.update_status("⏳ 데이터 엔진 로딩 중...")
+        threading.Thread(target=self._load_data_libs_background, daemon=True).start()
+        
+        # 설정 파일 외부 변경 감시 시작
+        self.root.after(int(self.settings.get('settings_watch_seconds', 2) * 1000), self.watch_settings_file)
+    
+    def _load_data_libs_background(self):
+        """백그라운드 pandas/numpy 로드"""
+        load_data_libs()
+        self.data_ready_ms = (time.perf_counter() - self.startup_started) * 1000
+        self.root.after(0, self._on_data_libs_ready)
+    
+    def _on_data_libs_ready(self):
+        """데이터 엔진 준비 완료"""
+        self.update_status("처리 준비 완료")
+        
+        # 시작 시간 측정용 실행이면 결과 출력 후 종료
+        if self.startup_probe:
+            print(f"READY {self.ui_ready_ms:.1f} {self.data_ready_ms:.1f}", flush=True)
+            self.root.destroy()
+    
+    def set_splash_status(self, text):
+        """스플래시 진행 상태 표시"""
+        self.splash_status.config(text=text)
+        self.splash.update()
     
     def show_splash_screen(self):
         """스플래시 스크린"""
@@ -1943,12 +4454,13 @@ Manual Review Needed: {metrics['unmatched_count']}
                 font=('SF Pro Display', 18),
                 bg=self.colors['bg'], fg=self.colors['neon_yellow']).pack(pady=10)
         
-        tk.Label(splash, text="Initializing...",
-                font=('SF Pro Display', 14),
-                bg=self.colors['bg'], fg=self.colors['text_secondary']).pack(pady=30)
+        self.splash_status = tk.Label(splash, text="Initializing...",
+                                     font=('SF Pro Display', 14),
+                                     bg=self.colors['bg'], fg=self.colors['text_secondary'])
+        self.splash_status.pack(pady=30)
         
-        # 2초 후 닫기
-        splash.after(2000, splash.destroy)
+        # 고정 대기 없이 준비되는 즉시 on_ready에서 닫음
+        return splash
 
 # 상품 규칙 다이얼로그
 class ProductRuleDialog:
@@ -1994,6 +4506,8 @@ class ProductRuleDialog:
         tk.Button(btn_frame, text="Cancel", bg='#ff0088', fg='white',
                  font=('SF Pro Display', 12), bd=0, padx=30, pady=10,
                  command=self.dialog.destroy).pack(side='left')
+        
+        parent.wait_window(self.dialog)
     
     def save(self):
         self.result = {
@@ -2008,10 +4522,334 @@ class ProductRuleDialog:
         
         self.dialog.destroy()
 
+# 컬럼 매핑 프로필 다이얼로그 (다른 채널 양식의 컬럼 → 표준 컬럼)
+class ColumnMappingDialog:
+    def __init__(self, parent, columns, targets, default_name):
+        self.result = None
+        self.targets = targets
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Column Mapping Profile")
+        self.dialog.geometry("520x320")
+        self.dialog.configure(bg='#1a1a1a')
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        tk.Label(self.dialog, text="Profile Name:", bg='#1a1a1a', fg='white',
+                font=('SF Pro Display', 12)).grid(row=0, column=0, padx=20, pady=10, sticky='w')
+        self.name_entry = tk.Entry(self.dialog, font=('SF Pro Display', 12),
+                                 bg='#2a2a2a', fg='white', insertbackground='white')
+        self.name_entry.insert(0, default_name)
+        self.name_entry.grid(row=0, column=1, padx=20, pady=10, sticky='ew')
+        
+        # 표준 컬럼별 원본 컬럼 선택 (같은 이름이 있으면 미리 선택)
+        self.combos = {}
+        for i, target in enumerate(targets, start=1):
+            required = " *" if target in REQUIRED_COLUMNS else ""
+            tk.Label(self.dialog, text=f"{target}{required}:", bg='#1a1a1a', fg='white',
+                    font=('SF Pro Display', 12)).grid(row=i, column=0, padx=20, pady=6, sticky='w')
+            
+            combo = ttk.Combobox(self.dialog, values=[''] + columns, state='readonly',
+                               font=('SF Pro Display', 12))
+            combo.set(target if target in columns else '')
+            combo.grid(row=i, column=1, padx=20, pady=6, sticky='ew')
+            self.combos[target] = combo
+        
+        self.dialog.grid_columnconfigure(1, weight=1)
+        
+        # 버튼들
+        btn_frame = tk.Frame(self.dialog, bg='#1a1a1a')
+        btn_frame.grid(row=len(targets) + 1, column=0, columnspan=2, pady=20)
+        
+        tk.Button(btn_frame, text="Save", bg='#00ff88', fg='black',
+                 font=('SF Pro Display', 12), bd=0, padx=30, pady=10,
+                 command=self.save).pack(side='left', padx=10)
+        
+        tk.Button(btn_frame, text="Cancel", bg='#ff0088', fg='white',
+                 font=('SF Pro Display', 12), bd=0, padx=30, pady=10,
+                 command=self.dialog.destroy).pack(side='left')
+        
+        parent.wait_window(self.dialog)
+    
+    def save(self):
+        name = self.name_entry.get().strip()
+        if not name:
+            messagebox.showerror("Error", "Profile name is required")
+            return
+        
+        missing = [target for target in REQUIRED_COLUMNS if not self.combos[target].get()]
+        if missing:
+            messagebox.showerror("Error", f"Required columns: {', '.join(missing)}")
+            return
+        
+        mapping = {}
+        for target, combo in self.combos.items():
+            source = combo.get()
+            if source in mapping:
+                messagebox.showerror("Error", f"'{source}' is mapped twice")
+                return
+            if source and source != target:
+                mapping[source] = target
+        
+        self.result = (name, mapping)
+        self.dialog.destroy()
+
+# 규칙 리포트 다이얼로그 (분석/압축 결과 확인 후 일괄 적용)
+class RuleReportDialog:
+    def __init__(self, parent, title, summary, lines, action_text=None, confirm_text=None):
+        self.result = None
+        self.confirm_text = confirm_text
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("800x500")
+        self.dialog.configure(bg='#1a1a1a')
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        tk.Label(self.dialog, text=summary, bg='#1a1a1a', fg='#ffdd00',
+                font=('SF Pro Display', 14, 'bold')).pack(anchor='w', padx=20, pady=(20, 10))
+
+        # 상세 목록
+        text = tk.Text(self.dialog, bg='#2a2a2a', fg='white',
+                      font=('SF Mono', 11), bd=0, wrap='none')
+        text.pack(fill='both', expand=True, padx=20)
+        text.insert(tk.END, '\n'.join(lines))
+        text.config(state='disabled')
+
+        # 버튼들
+        btn_frame = tk.Frame(self.dialog, bg='#1a1a1a')
+        btn_frame.pack(pady=20)
+
+        # 적용할 동작이 없으면 닫기만 (설명 보기 등)
+        if action_text:
+            tk.Button(btn_frame, text=action_text, bg='#00ff88', fg='black',
+                     font=('SF Pro Display', 12), bd=0, padx=30, pady=10,
+                     command=self.apply).pack(side='left', padx=10)
+
+        tk.Button(btn_frame, text="닫기", bg='#ff0088', fg='white',
+                 font=('SF Pro Display', 12), bd=0, padx=30, pady=10,
+                 command=self.dialog.destroy).pack(side='left')
+
+        parent.wait_window(self.dialog)
+
+    def apply(self):
+        if messagebox.askyesno("적용 확인", self.confirm_text, parent=self.dialog):
+            self.result = True
+            self.dialog.destroy()
+
+# 시작 시간 벤치마크
+def run_startup_benchmark(runs=5):
+    """콜드/웜 시작 시간 측정 (첫 실행 = 콜드, 이후 = 웜)"""
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable, '--startup-probe']
+    else:
+        command = [sys.executable, os.path.abspath(__file__), '--startup-probe']
+    
+    results = []
+    for i in range(runs):
+        started = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        ui_ms = data_ms = None
+        for line in process.stdout:
+            if line.startswith('READY'):
+                _, ui_ms, data_ms = line.split()
+                break
+        wall_ms = (time.perf_counter() - started) * 1000
+        process.wait()
+        
+        if ui_ms is None:
+            print(f"실행 {i + 1}: 준비 신호 없음 (종료 코드 {process.returncode})")
+            continue
+        
+        kind = 'cold' if i == 0 else 'warm'
+        results.append({'kind': kind, 'wall_ms': round(wall_ms, 1),
+                        'ui_ms': float(ui_ms), 'data_ms': float(data_ms)})
+        print(f"{kind:>4}: 완전 준비까지 {wall_ms:7.1f}ms (프로세스 내 창 표시 {float(ui_ms):7.1f}ms, "
+              f"데이터 엔진 {float(data_ms):7.1f}ms)")
+    
+    # 추이를 볼 수 있도록 누적 기록
+    bench_file = 'startup_bench_v4.json'
+    try:
+        history = []
+        if os.path.exists(bench_file):
+            with open(bench_file, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        history.append({'time': datetime.now().isoformat(timespec='seconds'), 'runs': results})
+        with open(bench_file, 'w', encoding='utf-8') as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"벤치마크 기록 저장 오류: {e}")
+    
+    return results
+
+def check_option_parser():
+    """OPTION_PARSE_EXAMPLES로 옵션 해석 점검 - 모두 맞으면 True"""
+    load_data_libs()
+    options = pd.Series([example[0] for example in OPTION_PARSE_EXAMPLES], dtype=object)
+    parsed = parse_options(options)
+    
+    failures = 0
+    for (option, measure, packs, sets), actual_measure, actual_packs, actual_sets in zip(
+            OPTION_PARSE_EXAMPLES, parsed['옵션용량'], parsed['옵션개수'], parsed['세트배수']):
+        actual_measure = None if pd.isna(actual_measure) else actual_measure
+        ok = (actual_measure, actual_packs, actual_sets) == (measure, packs, sets)
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {option!r}: 용량 {actual_measure} • 낱개 {actual_packs} × 세트 {actual_sets}"
+              + ("" if ok else f" (기대값 {measure} • {packs} × {sets})"))
+    print(f"옵션 해석 점검: {len(OPTION_PARSE_EXAMPLES) - failures}/{len(OPTION_PARSE_EXAMPLES)} 통과")
+    return failures == 0
+
+def check_order_file_reader():
+    """제목 행이 있는/없는 CSV·TSV를 인코딩별로 만들어 read_order_file 점검 - 모두 맞으면 True"""
+    load_data_libs()
+    header = ['주문고유번호', '상품명', '주문수량', '주문선택사항']
+    body = [['1001', '꽃샘 꿀유자차S 2kg', '1', '1.5Lx2'], ['1002', '백제 쌀국수', '2', '']]
+    cases = [(encoding, sep, title) for encoding in CSV_ENCODINGS for sep in (',', '\t') for title in (False, True)]
+    
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for encoding, sep, title in cases:
+            path = os.path.join(directory, 'orders.tsv' if sep == '\t' else 'orders.csv')
+            with open(path, 'w', encoding=encoding, newline='') as f:
+                writer = csv.writer(f, delimiter=sep)
+                if title:
+                    writer.writerow(['주문 내역'] + [''] * (len(header) - 1))
+                writer.writerows([header] + body)
+            
+            df = read_order_file(path, 1 if title else 0, {'주문고유번호': str})
+            ok = list(df.columns) == header and df['상품명'].tolist() == [row[1] for row in body]
+            failures += not ok
+            label = f"{encoding} {'TSV' if sep == chr(9) else 'CSV'}{' (제목 행)' if title else ''}"
+            print(f"{'✅' if ok else '❌'} {label}: {list(df.columns)}")
+    print(f"주문 파일 읽기 점검: {len(cases) - failures}/{len(cases)} 통과 (pyarrow {'있음' if has_pyarrow() else '없음'})")
+    return failures == 0
+
+def run_string_benchmark(rows=100000, settings_file='playauto_settings_v4.json'):
+    """텍스트 컬럼 object(str) vs Arrow 문자열 비교 (전처리/키 추출/매칭/정렬/메모리)"""
+    load_data_libs()
+    if os.path.exists(settings_file):
+        with open(settings_file, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    else:
+        settings = {'work_order': [], 'work_config': {}}
+    
+    rules = CompiledRuleSet.rules_from_settings(settings)
+    compiled = CompiledRuleSet(rules, CompiledRuleSet.hash_settings(settings))
+    
+    # 규칙에서 뽑은 상품명 + 매칭되지 않는 상품명으로 합성 주문 생성
+    rng = np.random.default_rng(0)
+    names = [f"{rule['brand']} {rule['product_name'] if rule['product_name'] != 'All' else '상품'}".strip()
+             for rule in rules] or ['상품']
+    names += [f"기타브랜드{i} 상품{i}" for i in range(max(len(names) // 4, 1))]
+    options = ['', '1개', '2개 세트', '500g x 2', '대용량 1kg']
+    source = pd.DataFrame({
+        '상품명': rng.choice(np.array(names, dtype=object), rows),
+        '주문선택사항': rng.choice(np.array(options, dtype=object), rows),
+        '주문수량': rng.integers(1, 4, rows),
+        '주문고유번호': (rng.integers(0, rows // 2, rows)).astype(str).astype(object),
+    })
+    
+    modes = [('object', str)]
+    arrow_dtype = text_dtype(True)
+    if arrow_dtype is str:
+        print("pyarrow가 설치되어 있지 않아 Arrow 문자열 모드는 건너뜁니다.")
+    else:
+        modes.append(('arrow', arrow_dtype))
+    
+    results = []
+    for mode, dtype in modes:
+        timings = {}
+        started = time.perf_counter()
+        df = source.copy()
+        df[TEXT_COLUMNS] = df[TEXT_COLUMNS].astype(dtype)
+        timings['load'] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        _normalize_cache.clear()
+        _option_cache.clear()
+        df = preprocess_orders(df, dtype, BrandTrie(compiled.by_brand), timings)
+        timings['preprocess'] = time.perf_counter() - started - timings['normalize']
+        
+        started = time.perf_counter()
+        codes, uniques = pd.MultiIndex.from_frame(df[['brand', '상품명_정규화', '옵션_정규화']]).factorize()
+        timings['factorize'] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        rule_stats = compiled.new_stats()
+        match, finish = compiled.matcher(rule_stats, settings.get('matcher_engine', 'interpreted'))
+        for brand, product_name, order_option in uniques:
+            match(brand, product_name, order_option)
+        finish()
+        timings['match'] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        df.sort_values(['주문고유번호', 'full_product_name'])
+        timings['sort'] = time.perf_counter() - started
+        
+        text_columns = TEXT_COLUMNS + ['full_product_name', 'brand']
+        memory_mb = df[text_columns].memory_usage(index=False, deep=True).sum() / 1024 / 1024
+        total_ms = sum(timings.values()) * 1000
+        results.append({'mode': mode, 'rows': rows, 'unique_keys': len(uniques),
+                        'text_memory_mb': round(memory_mb, 1), 'total_ms': round(total_ms, 1),
+                        **{f"{stage}_ms": round(seconds * 1000, 1) for stage, seconds in timings.items()}})
+        print(f"{mode:>6}: 텍스트 메모리 {memory_mb:7.1f}MB, 합계 {total_ms:8.1f}ms ("
+              + ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in timings.items()) + ")")
+    
+    # 추이를 볼 수 있도록 누적 기록
+    bench_file = 'string_bench_v4.json'
+    try:
+        history = []
+        if os.path.exists(bench_file):
+            with open(bench_file, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        history.append({'time': datetime.now().isoformat(timespec='seconds'), 'results': results})
+        with open(bench_file, 'w', encoding='utf-8') as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"벤치마크 기록 저장 오류: {e}")
+    
+    return results
+
 # 메인 실행
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="플레이오토 송장 분류 시스템")
+    parser.add_argument('--bench-startup', type=int, nargs='?', const=5, metavar='N',
+                        help="시작 시간 벤치마크 N회 실행 (첫 회는 콜드, 이후 웜)")
+    parser.add_argument('--bench-strings', type=int, nargs='?', const=100000, metavar='ROWS',
+                        help="텍스트 컬럼 object vs Arrow 문자열 벤치마크 (합성 주문 ROWS행)")
+    parser.add_argument('--check-options', action='store_true',
+                        help="옵션 해석(낱개 수/세트 배수) 예시 점검")
+    parser.add_argument('--check-csv', action='store_true',
+                        help="CSV/TSV 주문 파일 읽기 점검 (인코딩, 제목 행)")
+    parser.add_argument('--profile', metavar='NAME',
+                        help="사용할 설정 프로필 (기본: 마지막으로 선택한 프로필)")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    # 지정한 프로필이 없으면 새 기본 프로필을 만들지 않고 종료 (오타 방지)
+    if args.profile is not None and (not valid_profile_name(args.profile) or args.profile not in list_profiles()):
+        print(f"Error: 프로필을 찾을 수 없습니다: {args.profile} (사용 가능: {', '.join(list_profiles())})")
+        sys.exit(1)
+    
+    if args.bench_startup:
+        run_startup_benchmark(args.bench_startup)
+        return
+    
+    if args.check_options:
+        sys.exit(0 if check_option_parser() else 1)
+    
+    if args.check_csv:
+        sys.exit(0 if check_order_file_reader() else 1)
+    
+    if args.bench_strings:
+        run_string_benchmark(args.bench_strings, profile_paths(args.profile or read_active_profile())[0])
+        return
+    
     try:
-        app = PlayAutoOrderClassifierV41()
+        app = PlayAutoOrderClassifierV41(profile=args.profile)
+        app.startup_probe = args.startup_probe
         app.run()
     except Exception as e:
         print(f"Error: {e}")
@@ -2020,6 +4858,7 @@ def main():
         messagebox.showerror("Fatal Error", f"Application error:\n{str(e)}")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 빌드된 실행파일에서 매칭 워커 프로세스 실행
     success = main()
     if not success:
         sys.exit(1)